@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CSV Image Checker at Synthetic Scale
+Kept for the documented command line; the code lives in wpmedia/benchmark.py.
+Same as: python -m wpmedia benchmark ...
+"""
+
+from wpmedia.benchmark import main
+
+if __name__ == "__main__":
+    exit(main())
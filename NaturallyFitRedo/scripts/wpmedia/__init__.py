@@ -0,0 +1,27 @@
+"""
+wpmedia - WordPress Media Tools for the NaturallyFit Migration
+==============================================================
+Checks WooCommerce CSV image URLs against an uploads folder (or the live
+site) and extracts original images from wp-content/uploads.
+
+Usage (from the scripts folder):
+  python -m wpmedia check "C:/path/to/products.csv" "C:/path/to/uploads-originals"
+  python -m wpmedia extract "C:/path/to/uploads" "C:/path/to/output"
+  python -m wpmedia benchmark
+
+Importing the package is cheap: the tools and their heavier dependencies
+(pyarrow, Pillow, asyncio, multiprocessing) load only when used.
+"""
+
+from .rules import (
+    IMAGE_EXTENSIONS,
+    THUMBNAIL_PATTERN,
+    WEBP_EXTENSION,
+    get_original_name,
+    is_scaled,
+    is_thumbnail,
+    to_posix,
+    variant_key,
+)
+from .uploads import UploadsIndex, clear_index_cache, load_index
+from .variants import Variant, VariantIndex
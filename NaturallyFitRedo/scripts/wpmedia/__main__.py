@@ -0,0 +1,3 @@
+from .cli import main
+
+exit(main())
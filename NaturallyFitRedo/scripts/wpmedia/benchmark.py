@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CSV Image Checker at Synthetic Scale
+===================================================
+Generates a synthetic WordPress uploads tree (year/month folders, originals
+plus -WxH thumbnails and -scaled copies) and a matching WooCommerce CSV with
+controlled rates of missing, WebP and renamed images, then times each phase
+of the checker (wpmedia.check) and records its peak memory.
+
+Usage:
+  python benchmark_csv_images.py
+  python -m wpmedia benchmark
+  python benchmark_csv_images.py --files 10000 100000 --rows 5000 50000
+  python benchmark_csv_images.py --output bench.json --baseline old.json
+
+Phases:
+  scan            a fresh UploadsIndex lookup over the whole tree
+  read_csv        csv.DictReader over the product CSV
+  extract_paths   extract_image_path() for every image URL
+  lookup          exact path lookup against the scanned index
+  find_similar    find_similar_files() on a sample of misses (per-call cost,
+                  including the one-time per-folder stem index)
+  fuzzy_build     TrigramIndex over one file per image (as check --fuzzy)
+  fuzzy_search    TrigramIndex.search() for every miss
+  columnar_read   columnar_check.read_table() (pyarrow if installed)
+  columnar_resolve  bulk path extraction + hash join for every row
+  main            check.main() end to end, only with --main
+
+Results are written as JSON. With --baseline, any phase slower than the
+baseline by more than --tolerance makes the script exit with status 1.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from . import check
+from . import columnar_check
+from .fuzzy_match import TrigramIndex
+from .uploads import UploadsIndex, clear_index_cache
+
+SITE_URL = "https://naturallyfit.ca/wp-content/uploads"
+
+SLUG_WORDS = [
+    "whey",
+    "protein",
+    "isolate",
+    "creatine",
+    "monohydrate",
+    "pre",
+    "workout",
+    "bcaa",
+    "amino",
+    "mass",
+    "gainer",
+    "fat",
+    "burner",
+    "omega",
+    "vitamin",
+    "greens",
+    "collagen",
+    "casein",
+    "shaker",
+    "bar",
+    "chocolate",
+    "vanilla",
+    "strawberry",
+    "cookies",
+    "cream",
+    "unflavoured",
+    "lb",
+    "servings",
+]
+THUMBNAIL_SIZES = ["150x150", "300x300", "600x600", "768x768", "1024x1024"]
+
+
+def make_slug(rng, index):
+    """Product-like slug, unique via the index suffix."""
+    return "-".join(rng.sample(SLUG_WORDS, 3)) + f"-{index}"
+
+
+def generate_uploads(root, total_files, thumbnails, rng):
+    """
+    Create empty files laid out like wp-content/uploads.
+    Returns: list of original relative paths (jpg/png).
+    """
+    originals = []
+    created = 0
+    index = 0
+    while created < total_files:
+        year = 2016 + index % 9
+        month = index % 12 + 1
+        folder = Path(root) / str(year) / f"{month:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+
+        slug = make_slug(rng, index)
+        ext = ".png" if index % 5 == 0 else ".jpg"
+        names = [slug + ext, slug + ".webp"]
+        names += [f"{slug}-{size}{ext}" for size in THUMBNAIL_SIZES[:thumbnails]]
+        if index % 7 == 0:
+            names.append(f"{slug}-scaled{ext}")
+        for name in names[: total_files - created]:
+            (folder / name).touch()
+            created += 1
+
+        originals.append(f"{year}/{month:02d}/{slug}{ext}")
+        index += 1
+    return originals
+
+
+def generate_csv(csv_path, originals, rows, missing_rate, webp_rate, renamed_rate, rng):
+    """Write a WooCommerce-style CSV referencing the synthetic uploads."""
+    counts = {"ok": 0, "missing": 0, "webp": 0, "renamed": 0}
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "SKU", "Name", "Images"])
+        for i in range(rows):
+            rel_path = rng.choice(originals)
+            roll = rng.random()
+            if roll < missing_rate:
+                rel_path = f"2015/01/{make_slug(rng, 10_000_000 + i)}.jpg"
+                kind = "missing"
+            elif roll < missing_rate + webp_rate:
+                rel_path = rel_path.rsplit(".", 1)[0] + ".webp"
+                kind = "webp"
+            elif roll < missing_rate + webp_rate + renamed_rate:
+                stem, ext = rel_path.rsplit(".", 1)
+                rel_path = f"{stem}-2.{ext}"
+                kind = "renamed"
+            else:
+                kind = "ok"
+            counts[kind] += 1
+            writer.writerow(
+                [i + 1, f"SKU-{i + 1}", f"Product {i + 1}", f"{SITE_URL}/{rel_path}"]
+            )
+    return counts
+
+
+def measure(func, track_memory):
+    """Run func once for time; optionally again under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func()
+    timing = {
+        "seconds": round(time.perf_counter() - start, 4),
+        "cpu_seconds": round(time.process_time() - cpu_start, 4),
+    }
+    if track_memory:
+        tracemalloc.start()
+        func()
+        timing["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    return result, timing
+
+
+def run_scale(workdir, files, rows, args):
+    """Generate one synthetic dataset and time every phase against it."""
+    rng = random.Random(args.seed)
+    uploads = Path(workdir) / f"uploads-{files}"
+    csv_path = Path(workdir) / f"products-{files}-{rows}.csv"
+
+    start = time.perf_counter()
+    if uploads.exists():
+        shutil.rmtree(uploads)
+    originals = generate_uploads(uploads, files, args.thumbnails, rng)
+    counts = generate_csv(
+        csv_path,
+        originals,
+        rows,
+        args.missing_rate,
+        args.webp_rate,
+        args.renamed_rate,
+        rng,
+    )
+    generate_seconds = round(time.perf_counter() - start, 2)
+    print(
+        f"\n[{files:,} files / {rows:,} rows] generated in {generate_seconds}s {counts}"
+    )
+
+    phases = {}
+    track = not args.no_memory
+
+    def record(name, func, items):
+        result, timing = measure(func, track)
+        timing["items"] = items
+        timing["per_second"] = (
+            round(items / timing["seconds"]) if timing["seconds"] else None
+        )
+        phases[name] = timing
+        memory = f", peak {timing['peak_mb']} MB" if "peak_mb" in timing else ""
+        print(f"  {name:<16} {timing['seconds']:>9.3f}s  ({items:,} items{memory})")
+        return result
+
+    # Built directly: scan_uploads_folder() would return the cached index
+    available = record("scan", lambda: UploadsIndex.build(uploads), files)
+
+    def read_csv():
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+
+    products = record("read_csv", read_csv, rows)
+    urls = [p["Images"] for p in products]
+    paths = record(
+        "extract_paths",
+        lambda: [check.extract_image_path(u) for u in urls],
+        rows,
+    )
+    misses = record(
+        "lookup", lambda: [p for p in paths if p.lower() not in available], rows
+    )
+
+    sample = misses[: args.max_similar]
+    if sample:
+        record(
+            "find_similar",
+            lambda: [check.find_similar_files(p, available, uploads) for p in sample],
+            len(sample),
+        )
+        per_call = phases["find_similar"]["seconds"] / len(sample)
+        phases["find_similar"]["projected_seconds"] = round(per_call * len(misses), 2)
+
+    if not args.skip_fuzzy:
+        index = record(
+            "fuzzy_build",
+            lambda: TrigramIndex(available.variants().representatives()),
+            files,
+        )
+        if misses:
+            record(
+                "fuzzy_search",
+                lambda: [index.search(p, limit=1) for p in misses],
+                len(misses),
+            )
+
+    speedup = None
+    if not args.skip_columnar:
+        table = record(
+            "columnar_read", lambda: columnar_check.read_table(csv_path), rows
+        )
+        col_paths, col_resolved = record(
+            "columnar_resolve",
+            lambda: columnar_check.resolve_paths(
+                table, "Images", available, check.extract_image_path
+            ),
+            rows,
+        )
+        row_resolved = [available.get(p.lower()) for p in paths]
+        if col_paths != paths or col_resolved != row_resolved:
+            raise SystemExit("columnar engine results differ from the row engine")
+
+        row_seconds = sum(
+            phases[name]["seconds"] for name in ("read_csv", "extract_paths", "lookup")
+        )
+        col_seconds = (
+            phases["columnar_read"]["seconds"] + phases["columnar_resolve"]["seconds"]
+        )
+        speedup = round(row_seconds / col_seconds, 2) if col_seconds else None
+        backend = "pyarrow" if table.arrow_table is not None else "csv module"
+        print(f"  columnar speedup vs rows: {speedup}x ({backend}, results identical)")
+
+    if args.main:
+        argv = [str(csv_path), str(uploads), "--engine", args.engine]
+
+        def run_main():
+            clear_index_cache()  # time the real scan, not a cached one
+            with contextlib.redirect_stdout(io.StringIO()):
+                return check.main(argv)
+
+        _, timing = measure(run_main, False)
+        timing["items"] = rows
+        phases["main"] = timing
+        print(f"  {'main':<16} {timing['seconds']:>9.3f}s  ({rows:,} rows)")
+
+    if not args.keep:
+        shutil.rmtree(uploads, ignore_errors=True)
+        csv_path.unlink()
+
+    return {
+        "files": files,
+        "rows": rows,
+        "misses": len(misses),
+        "csv_mix": counts,
+        "generate_seconds": generate_seconds,
+        "columnar_speedup": speedup,
+        "phases": phases,
+    }
+
+
+def compare_to_baseline(results, baseline_path, tolerance):
+    """Return a list of regression messages (empty if none)."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(run["files"], run["rows"]): run for run in baseline.get("runs", [])}
+
+    regressions = []
+    for run in results["runs"]:
+        old = previous.get((run["files"], run["rows"]))
+        if not old:
+            continue
+        for name, timing in run["phases"].items():
+            old_seconds = old["phases"].get(name, {}).get("seconds")
+            # Ignore phases too short to time reliably
+            if not old_seconds or old_seconds < 0.05:
+                continue
+            ratio = timing["seconds"] / old_seconds
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{run['files']:,} files / {run['rows']:,} rows: {name} "
+                    f"{old_seconds:.3f}s -> {timing['seconds']:.3f}s ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Benchmark the CSV image checker on synthetic uploads trees",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        nargs="+",
+        default=[10_000],
+        help="Upload tree sizes to generate",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[5_000],
+        help="CSV row counts to generate",
+    )
+    parser.add_argument(
+        "--missing-rate", type=float, default=0.05, help="Share of rows with no file"
+    )
+    parser.add_argument(
+        "--webp-rate", type=float, default=0.05, help="Share of rows pointing at .webp"
+    )
+    parser.add_argument(
+        "--renamed-rate",
+        type=float,
+        default=0.05,
+        help="Share of rows with a renamed file",
+    )
+    parser.add_argument(
+        "--thumbnails", type=int, default=3, help="Thumbnail sizes per original (0-5)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Random seed for reproducible trees"
+    )
+    parser.add_argument(
+        "--max-similar",
+        type=int,
+        default=20,
+        help="Misses to time find_similar_files on",
+    )
+    parser.add_argument(
+        "--skip-fuzzy", action="store_true", help="Skip the fuzzy index phases"
+    )
+    parser.add_argument(
+        "--skip-columnar", action="store_true", help="Skip the columnar engine phases"
+    )
+    parser.add_argument(
+        "--main", action="store_true", help="Also time main() end to end (slow)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["rows", "columnar"],
+        default="rows",
+        help="Engine for the --main run (default: rows)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass"
+    )
+    parser.add_argument(
+        "--workdir", help="Where to generate data (default: a temp folder)"
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the generated data")
+    parser.add_argument(
+        "--output", "-o", help="Write results JSON here (default: stdout)"
+    )
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown vs baseline (0.25 = 25%%)",
+    )
+
+    args = parser.parse_args(argv)
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="csv-image-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 70)
+    print("CSV Image Checker Benchmark")
+    print("=" * 70)
+    print(f"  Work folder: {workdir}")
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "thumbnails": args.thumbnails,
+            "missing_rate": args.missing_rate,
+            "webp_rate": args.webp_rate,
+            "renamed_rate": args.renamed_rate,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "runs": [],
+    }
+
+    try:
+        for files in args.files:
+            for rows in args.rows:
+                results["runs"].append(run_scale(workdir, files, rows, args))
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"\nResults saved to: {args.output}")
+    else:
+        print("\n" + report)
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSIONS (>{args.tolerance:.0%} slower than {args.baseline}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
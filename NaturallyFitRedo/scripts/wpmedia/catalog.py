@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+SQLite Catalog of an Uploads Folder
+===================================
+Keeps what a walk of wp-content/uploads learns in a SQLite file, so later
+runs answer from the database instead of walking the tree again.
+
+  - one row per file: path, size, mtime, extension, variant group and
+    whether it is an original (same rules as extract)
+  - refresh is incremental: a folder whose mtime hasn't changed is not
+    listed again (use --full after overwriting files in place, which
+    doesn't touch the folder's mtime); folders are listed in parallel
+    (--scan-workers), like check and extract
+  - image dimensions (Pillow) and SHA-1 content hashes are filled lazily,
+    only when asked for, and kept until the file changes
+  - indexes on stem, folder, hash and case-insensitive path
+
+Usage:
+  python -m wpmedia catalog "C:/path/to/uploads"
+  python -m wpmedia catalog "C:/path/to/uploads" --check products.csv
+  python -m wpmedia catalog "C:/path/to/uploads" --hash --duplicates
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import posixpath
+import sqlite3
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .check import extract_image_path, sniff_delimiter, split_image_urls
+from .columnar_check import extract_path
+from .extract import format_size, print_analysis
+from .rules import (
+    IMAGE_EXTENSIONS,
+    WEBP_EXTENSION,
+    is_scaled,
+    is_thumbnail,
+    variant_key,
+)
+from .uploads import DEFAULT_WALK_WORKERS, list_dir, walk_parallel
+
+SCHEMA_VERSION = 1
+DEFAULT_WORKERS = 16
+HASH_CHUNK = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER REFERENCES dirs(id) ON DELETE CASCADE,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    dir_id INTEGER NOT NULL REFERENCES dirs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    stem TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    variant_key TEXT,
+    is_variant INTEGER NOT NULL,
+    is_original INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS files_stem ON files(stem);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir_id);
+CREATE INDEX IF NOT EXISTS files_hash ON files(hash);
+CREATE INDEX IF NOT EXISTS files_variant ON files(variant_key);
+CREATE INDEX IF NOT EXISTS files_path_nocase ON files(path COLLATE NOCASE);
+"""
+
+IMAGE_EXTS = sorted(IMAGE_EXTENSIONS | WEBP_EXTENSION)
+
+
+def default_db_path(uploads_path):
+    """uploads.catalog.sqlite next to (not inside) the uploads folder."""
+    uploads_path = Path(uploads_path).resolve()
+    return uploads_path.parent / f"{uploads_path.name}.catalog.sqlite"
+
+
+def connect(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS dirs;")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def file_row(dir_id, rel_dir, name, size, mtime_ns):
+    """Column values for one file (see SCHEMA)."""
+    path = f"{rel_dir}/{name}" if rel_dir else name
+    stem, ext = posixpath.splitext(name)
+    ext = ext.lower()
+    image = ext in IMAGE_EXTENSIONS or ext in WEBP_EXTENSION
+    variant = image and (is_thumbnail(name) or is_scaled(name))
+    original = image and not variant and ext not in WEBP_EXTENSION
+    return (
+        dir_id,
+        name,
+        path,
+        stem.lower(),
+        ext,
+        size,
+        mtime_ns,
+        variant_key(path) if image else None,
+        int(variant),
+        int(original),
+    )
+
+
+def refresh(conn, uploads_path, full=False, workers=None):
+    """
+    Bring the catalog up to date, re-listing only folders whose mtime changed.
+    Folders are stat'ed and listed in parallel (uploads.walk_parallel).
+    Returns: {"scanned", "skipped", "added", "updated", "removed"} counts
+    """
+    root = Path(uploads_path)
+    counts = defaultdict(int)
+    known = {}
+    children = defaultdict(list)
+    for dir_id, parent_id, path, mtime_ns in conn.execute(
+        "SELECT id, parent_id, path, mtime_ns FROM dirs"
+    ):
+        known[path] = (dir_id, mtime_ns)
+        children[parent_id].append(path)
+
+    def visit(rel_dir):
+        # Runs on the walk's threads: filesystem calls only, no database
+        abs_dir = os.path.join(root, rel_dir) if rel_dir else str(root)
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            return None
+        dir_id, old_mtime = known.get(rel_dir, (None, None))
+        if dir_id is not None and old_mtime == mtime_ns and not full:
+            # Unchanged listing: only its subfolders need checking
+            return (mtime_ns, None), children.get(dir_id, [])
+        listing = list_dir(abs_dir, with_stats=True)
+        if listing is None:
+            # Unreadable right now: keep what the catalog has, retry next time
+            if dir_id is None:
+                return None
+            return (mtime_ns, None), children.get(dir_id, [])
+        subdirs = [f"{rel_dir}/{name}" if rel_dir else name for name in listing[2]]
+        return (mtime_ns, listing), subdirs
+
+    seen = {}
+    with conn:
+        for rel_dir, (mtime_ns, listing) in walk_parallel("", visit, workers):
+            parent_id = seen.get(posixpath.dirname(rel_dir)) if rel_dir else None
+            dir_id = known.get(rel_dir, (None, None))[0]
+            if listing is None:
+                counts["skipped"] += 1
+                seen[rel_dir] = dir_id
+                continue
+
+            counts["scanned"] += 1
+            if dir_id is None:
+                dir_id = conn.execute(
+                    "INSERT INTO dirs (parent_id, path, mtime_ns) VALUES (?, ?, ?)",
+                    (parent_id, rel_dir, mtime_ns),
+                ).lastrowid
+            else:
+                conn.execute(
+                    "UPDATE dirs SET mtime_ns = ? WHERE id = ?", (mtime_ns, dir_id)
+                )
+            seen[rel_dir] = dir_id
+
+            existing = {
+                name: (file_id, size, mtime)
+                for file_id, name, size, mtime in conn.execute(
+                    "SELECT id, name, size, mtime_ns FROM files WHERE dir_id = ?",
+                    (dir_id,),
+                )
+            }
+            inserts = []
+            updates = []
+            names, stats, _ = listing
+            for name, st in zip(names, stats):
+                old = existing.pop(name, None)
+                if old is None:
+                    inserts.append(
+                        file_row(dir_id, rel_dir, name, st.st_size, st.st_mtime_ns)
+                    )
+                elif old[1] != st.st_size or old[2] != st.st_mtime_ns:
+                    updates.append((st.st_size, st.st_mtime_ns, old[0]))
+
+            conn.executemany(
+                "INSERT INTO files (dir_id, name, path, stem, ext, size, mtime_ns,"
+                " variant_key, is_variant, is_original)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                inserts,
+            )
+            # Changed content: dimensions and hash are stale
+            conn.executemany(
+                "UPDATE files SET size = ?, mtime_ns = ?, width = NULL,"
+                " height = NULL, hash = NULL WHERE id = ?",
+                updates,
+            )
+            conn.executemany(
+                "DELETE FROM files WHERE id = ?",
+                [(file_id,) for file_id, _, _ in existing.values()],
+            )
+            counts["added"] += len(inserts)
+            counts["updated"] += len(updates)
+            counts["removed"] += len(existing)
+
+        # Folders that no longer exist (their files cascade)
+        gone = [(path,) for path in known if path not in seen]
+        if gone:
+            counts["removed"] += conn.execute(
+                "SELECT COUNT(*) FROM files JOIN dirs ON dirs.id = files.dir_id"
+                f" WHERE dirs.path IN ({','.join('?' * len(gone))})",
+                [path for (path,) in gone],
+            ).fetchone()[0]
+            conn.executemany("DELETE FROM dirs WHERE path = ?", gone)
+
+    return counts
+
+
+def _image_size(filepath):
+    from PIL import Image
+
+    try:
+        with Image.open(filepath) as img:
+            return img.size
+    except Exception:
+        return (0, 0)  # unreadable: recorded so it isn't retried every run
+
+
+def _content_hash(filepath):
+    digest = hashlib.sha1()
+    try:
+        with open(filepath, "rb") as f:
+            while chunk := f.read(HASH_CHUNK):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def fill_details(conn, uploads_path, dims=False, hashes=False, workers=None):
+    """
+    Compute missing dimensions (images only, needs Pillow) and content hashes.
+    Returns: (dims_filled, hashes_filled)
+    """
+    root = Path(uploads_path)
+    workers = workers or DEFAULT_WORKERS
+    filled = [0, 0]
+
+    jobs = []
+    if dims:
+        from .image_hashes import require_pillow
+
+        require_pillow()
+        marks = ",".join("?" * len(IMAGE_EXTS))
+        jobs.append(
+            (
+                0,
+                f"SELECT id, path FROM files WHERE width IS NULL AND ext IN ({marks})",
+                IMAGE_EXTS,
+                _image_size,
+                "UPDATE files SET width = ?, height = ? WHERE id = ?",
+            )
+        )
+    if hashes:
+        jobs.append(
+            (
+                1,
+                "SELECT id, path FROM files WHERE hash IS NULL",
+                [],
+                _content_hash,
+                "UPDATE files SET hash = ? WHERE id = ?",
+            )
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for slot, query, params, func, update in jobs:
+            rows = conn.execute(query, params).fetchall()
+            results = pool.map(func, [root / path for _, path in rows])
+            values = []
+            for (file_id, _), value in zip(rows, results):
+                if value is None:
+                    continue
+                if isinstance(value, tuple):
+                    values.append((*value, file_id))
+                else:
+                    values.append((value, file_id))
+            with conn:
+                conn.executemany(update, values)
+            filled[slot] = len(values)
+
+    return tuple(filled)
+
+
+def folder_stats(conn):
+    """The same statistics as extract.analyze_folder(), computed in SQL."""
+    image_marks = ",".join("?" * len(IMAGE_EXTS))
+    row = conn.execute(
+        f"""
+        SELECT COUNT(*), COALESCE(SUM(size), 0),
+               COALESCE(SUM(ext IN ({image_marks})), 0),
+               COALESCE(SUM(is_variant AND ext != '.webp'), 0),
+               COALESCE(SUM(ext = '.webp'), 0),
+               COALESCE(SUM(is_original), 0),
+               COALESCE(SUM(CASE WHEN is_original THEN size ELSE 0 END), 0)
+        FROM files
+        """,
+        IMAGE_EXTS,
+    ).fetchone()
+    stats = dict(
+        zip(
+            [
+                "total_files",
+                "total_size",
+                "images",
+                "thumbnails",
+                "webp",
+                "originals",
+                "original_size",
+            ],
+            row,
+        )
+    )
+    stats["by_extension"] = dict(
+        conn.execute("SELECT ext, COUNT(*) FROM files GROUP BY ext")
+    )
+    # First path segment, when it is a year folder
+    stats["by_year"] = dict(conn.execute("""
+            SELECT substr(path, 1, instr(path, '/') - 1) AS top, COUNT(*)
+            FROM files
+            WHERE instr(path, '/') > 1 AND top NOT GLOB '*[^0-9]*'
+            GROUP BY top
+            """))
+    return stats
+
+
+def check_csv(conn, csv_path):
+    """
+    Resolve every image URL in the CSV (all image columns) with one SQL join.
+    Returns: (total, found, [(sku, name, path, variants_available)] missing)
+    """
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f, delimiter=sniff_delimiter(csv_path))
+        image_columns = [c for c in reader.fieldnames if "image" in c.lower()]
+        refs = []
+        for row in reader:
+            sku = row.get("SKU", row.get("sku", ""))
+            name = row.get("Name", row.get("name", ""))
+            for column in image_columns:
+                for url in split_image_urls(row.get(column)):
+                    path = extract_path(url, extract_image_path) or url
+                    refs.append((sku, name, path))
+
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS refs (sku TEXT, name TEXT, path TEXT)"
+    )
+    conn.execute("DELETE FROM refs")
+    conn.executemany("INSERT INTO refs VALUES (?, ?, ?)", refs)
+    missing = conn.execute("""
+        SELECT sku, name, path FROM refs
+        WHERE NOT EXISTS (
+            SELECT 1 FROM files f WHERE f.path = refs.path COLLATE NOCASE
+        )
+        """).fetchall()
+    # Other sizes of the same image, via the variant group index
+    count_variants = "SELECT COUNT(*) FROM files WHERE variant_key = ?"
+    missing = [
+        (
+            sku,
+            name,
+            path,
+            conn.execute(count_variants, (variant_key(path),)).fetchone()[0],
+        )
+        for sku, name, path in missing
+    ]
+    return len(refs), len(refs) - len(missing), missing
+
+
+def duplicate_groups(conn):
+    """Returns: [(hash, count, total_bytes, [paths])] for identical files."""
+    groups = []
+    for digest, count, total in conn.execute("""
+        SELECT hash, COUNT(*), SUM(size) FROM files
+        WHERE hash IS NOT NULL
+        GROUP BY hash HAVING COUNT(*) > 1
+        ORDER BY SUM(size) - MIN(size) DESC
+        """).fetchall():
+        paths = [
+            path
+            for (path,) in conn.execute(
+                "SELECT path FROM files WHERE hash = ? ORDER BY path", (digest,)
+            )
+        ]
+        groups.append((digest, count, total, paths))
+    return groups
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Persistent SQLite catalog of an uploads folder"
+    )
+    parser.add_argument("uploads_path", help="Path to wp-content/uploads folder")
+    parser.add_argument(
+        "--db", help="Catalog file (default: <uploads>.catalog.sqlite beside it)"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Re-list every folder, not just changed"
+    )
+    parser.add_argument(
+        "--dims", action="store_true", help="Fill in missing image dimensions (Pillow)"
+    )
+    parser.add_argument(
+        "--hash", action="store_true", help="Fill in missing SHA-1 content hashes"
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="List byte-identical files (implies --hash)",
+    )
+    parser.add_argument(
+        "--check", nargs="+", metavar="CSV", help="Check CSV image URLs in SQL"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads for --dims/--hash (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=DEFAULT_WALK_WORKERS,
+        help="Folders listed in parallel during refresh; raise it for "
+        f"network mounts, 1 lists one at a time (default: {DEFAULT_WALK_WORKERS})",
+    )
+
+    args = parser.parse_args(argv)
+
+    uploads_path = Path(args.uploads_path)
+    if not uploads_path.exists():
+        print(f"Error: Uploads folder not found: {uploads_path}")
+        return 1
+
+    db_path = Path(args.db) if args.db else default_db_path(uploads_path)
+    print("=" * 60)
+    print("WordPress Uploads - Catalog")
+    print("=" * 60)
+    print(f"\nCatalog: {db_path}")
+
+    conn = connect(db_path)
+    start = time.perf_counter()
+    counts = refresh(conn, uploads_path, full=args.full, workers=args.scan_workers)
+    print(
+        f"  Refreshed in {time.perf_counter() - start:.2f}s:"
+        f" {counts['scanned']} folders listed, {counts['skipped']} unchanged;"
+        f" {counts['added']} added, {counts['updated']} updated,"
+        f" {counts['removed']} removed"
+    )
+
+    if args.dims or args.hash or args.duplicates:
+        start = time.perf_counter()
+        try:
+            dims_filled, hashes_filled = fill_details(
+                conn,
+                uploads_path,
+                dims=args.dims,
+                hashes=args.hash or args.duplicates,
+                workers=args.workers,
+            )
+        except RuntimeError as e:
+            print(f"  Skipped details: {e}")
+        else:
+            print(
+                f"  Details in {time.perf_counter() - start:.2f}s:"
+                f" {dims_filled} dimensions, {hashes_filled} hashes computed"
+            )
+
+    start = time.perf_counter()
+    stats = folder_stats(conn)
+    print(f"  Stats query: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+    print_analysis(stats)
+
+    if args.duplicates:
+        groups = duplicate_groups(conn)
+        wasted = sum(total - total // count for _, count, total, _ in groups)
+        print(
+            f"\n IDENTICAL FILES ({len(groups)} groups, {format_size(wasted)} extra):"
+        )
+        print("-" * 60)
+        for _, count, total, paths in groups[:10]:
+            print(f"  {count} copies, {format_size(total // count)} each:")
+            for path in paths[:5]:
+                print(f"         {path}")
+        if len(groups) > 10:
+            print(f"  ... and {len(groups) - 10} more groups")
+
+    for csv_path in args.check or []:
+        start = time.perf_counter()
+        total, found, missing = check_csv(conn, csv_path)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n CSV CHECK: {csv_path} ({elapsed:.1f} ms)")
+        print("-" * 60)
+        print(f"  Image URLs:         {total:,}")
+        print(f"  Found:              {found:,}")
+        print(f"  Missing:            {len(missing):,}")
+        recoverable = sum(1 for *_, variants in missing if variants)
+        print(f"    - Other sizes exist: {recoverable:,}")
+        for sku, name, path, variants in missing[:20]:
+            extra = f" ({variants} other sizes)" if variants else ""
+            print(f"  [{sku}] {name[:40]}: {path}{extra}")
+        if len(missing) > 20:
+            print(f"  ... and {len(missing) - 20} more")
+
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,935 @@
+#!/usr/bin/env python3
+"""
+Check CSV Product Images Against Uploads Folder
+================================================
+Compares image URLs in WooCommerce CSV against actual files in uploads folder.
+Identifies missing images and suggests fixes.
+
+Usage:
+  python check_csv_images.py "C:/path/to/products.csv" "C:/path/to/uploads-originals"
+  python check_csv_images.py "C:/path/to/products.csv" --remote
+  python -m wpmedia check "C:/path/to/products.csv" "C:/path/to/uploads-originals"
+"""
+
+import csv
+import json
+import posixpath
+import re
+import time
+from pathlib import Path
+from urllib.parse import urlparse, urlunparse, unquote
+from bisect import bisect_left
+from collections import defaultdict
+
+from . import columnar_check, image_hashes, image_integrity, instrument
+from .fuzzy_match import DEFAULT_AUTOFIX_THRESHOLD, MIN_REPORT_SCORE, TrigramIndex
+from .rewrite import RewriteRules, parse_rule, read_rules_file
+from .rules import to_posix
+from .uploads import DEFAULT_WALK_WORKERS, load_index
+
+# remote_check (asyncio, ssl) is imported only in --remote mode
+
+
+def extract_image_path(url):
+    """Extract the relative path from a WordPress image URL."""
+    if not url or not url.strip():
+        return None
+
+    # Parse URL and get path
+    parsed = urlparse(url.strip())
+    path = unquote(parsed.path)
+
+    # Extract everything after /wp-content/uploads/
+    match = re.search(r"/wp-content/uploads/(.+)$", path)
+    if match:
+        return match.group(1)
+
+    # Try just /uploads/
+    match = re.search(r"/uploads/(.+)$", path)
+    if match:
+        return match.group(1)
+
+    return path
+
+
+def scan_uploads_folder(uploads_path, workers=None):
+    """
+    Scan uploads folder (via the shared uploads index).
+    Returns: UploadsIndex - maps lower rel_path or lower filename to rel_path
+    """
+    return load_index(uploads_path, workers=workers)
+
+
+def find_similar_files(target_name, available_files, uploads_path):
+    """
+    Find files with similar names (different extension or size suffix) in
+    the target's folder, via the index's sorted per-folder stems.
+    Returns: [(match, rel_path)] in walk order
+    """
+    folder, slash, filename = to_posix(target_name).rpartition("/")
+    target_stem = posixpath.splitext(filename)[0].lower()
+    stems, numbers = available_files.folder_stems().get(
+        (folder + slash).lower(), ((), ())
+    )
+
+    found = {}
+    # Stem starts with target (exact, or with a size suffix the target lacks)
+    i = bisect_left(stems, target_stem)
+    while i < len(stems) and stems[i].startswith(target_stem):
+        found[numbers[i]] = "exact_stem" if stems[i] == target_stem else "starts_with"
+        i += 1
+    # Target starts with file stem (file might be base, target has suffix)
+    for end in range(1, len(target_stem)):
+        prefix = target_stem[:end]
+        i = bisect_left(stems, prefix)
+        while i < len(stems) and stems[i] == prefix:
+            found[numbers[i]] = "base_match"
+            i += 1
+
+    return [(match, available_files.rel_path(i)) for i, match in sorted(found.items())]
+
+
+def new_result(i, sku, name, image_url):
+    """Empty result record for CSV row i (see REPORT_FIELDS)."""
+    return {
+        "row": i + 1,
+        "sku": sku,
+        "name": name,
+        "status": None,
+        "url": image_url,
+        "path": None,
+        "resolved": None,
+        "suggestion": None,
+        "match": None,
+        "score": None,
+        "webp": False,
+        "reason": None,
+        "verified": None,
+    }
+
+
+def resolve_missing(
+    result, rel_path, available_files, uploads_path, fuzzy_index, fuzzy_threshold
+):
+    """Fill in a result whose path isn't in the uploads index: fixable or missing."""
+    # Check for WebP that should be JPG/PNG
+    result["webp"] = rel_path.endswith(".webp")
+
+    if "," in rel_path or "://" in rel_path:
+        # A gallery cell (several URLs): a suggestion for one of them would
+        # replace the whole cell under --fix. WordPress strips commas from
+        # upload names, so a real single path never gets here.
+        result.update(status="missing", reason="Several image URLs in one cell")
+        return result
+
+    # Try to find similar files
+    suggestions = find_similar_files(rel_path, available_files, uploads_path)
+
+    if suggestions:
+        # Prefer exact stem matches
+        exact = [s for s in suggestions if s[0] == "exact_stem"]
+        match, suggestion = exact[0] if exact else suggestions[0]
+        result.update(status="fixable", suggestion=suggestion, match=match)
+    elif fuzzy_index is not None:
+        # Renamed or re-uploaded elsewhere - rank candidates across all folders
+        # Thresholds below the hint cut-off still have to see their candidates
+        candidates = fuzzy_index.search(
+            rel_path, limit=1, min_score=min(fuzzy_threshold, MIN_REPORT_SCORE)
+        )
+        if candidates and candidates[0][0] >= fuzzy_threshold:
+            score, suggestion = candidates[0]
+            result.update(
+                status="fixable", suggestion=suggestion, match="fuzzy", score=score
+            )
+        elif candidates:
+            score, closest = candidates[0]
+            result.update(
+                status="missing",
+                suggestion=closest,
+                match="fuzzy",
+                score=score,
+                reason=f"File not found (closest: {closest}, score {score:.2f})",
+            )
+        else:
+            result.update(status="missing", reason="File not found")
+    else:
+        result.update(status="missing", reason="File not found")
+
+    return result
+
+
+def check_rows(
+    products, image_column, available_files, uploads_path, fuzzy_index, fuzzy_threshold
+):
+    """
+    Check each product's image against the uploads index.
+    Yields one result dict per product (see REPORT_FIELDS), as it is produced.
+    """
+    for i, product in enumerate(products):
+        image_url = product.get(image_column, "").strip()
+        result = new_result(
+            i,
+            product.get("SKU", product.get("sku", "")),
+            product.get("Name", product.get("name", f"Row {i + 1}")),
+            image_url,
+        )
+
+        if not image_url:
+            result["status"] = "empty"
+            yield result
+            continue
+
+        rel_path = extract_image_path(image_url)
+        if not rel_path:
+            result.update(
+                status="missing", path=image_url, reason="Could not parse URL"
+            )
+            yield result
+            continue
+
+        result["path"] = rel_path
+
+        # Check if file exists
+        resolved = available_files.get(rel_path.lower())
+
+        if resolved is not None:
+            result.update(status="found", resolved=resolved, match="exact")
+            yield result
+            continue
+
+        yield resolve_missing(
+            result,
+            rel_path,
+            available_files,
+            uploads_path,
+            fuzzy_index,
+            fuzzy_threshold,
+        )
+
+
+def check_rows_columnar(
+    table, image_column, available_files, uploads_path, fuzzy_index, fuzzy_threshold
+):
+    """
+    Columnar engine: resolve every image path in one bulk pass, then only
+    the misses go through find_similar_files/fuzzy matching row by row.
+    Yields the same results as check_rows().
+    """
+    paths, resolved = columnar_check.resolve_paths(
+        table, image_column, available_files, extract_image_path
+    )
+    urls = table.column(image_column)
+
+    def column_or(names, default):
+        for name in names:
+            if name in table.fieldnames:
+                return table.column(name)
+        return [default] * len(table)
+
+    skus = column_or(["SKU", "sku"], "")
+    names = column_or(["Name", "name"], None)
+
+    for i, rel_path in enumerate(paths):
+        image_url = (urls[i] or "").strip()
+        name = names[i] if names[i] is not None else f"Row {i + 1}"
+        result = new_result(i, skus[i], name, image_url)
+
+        if not image_url:
+            result["status"] = "empty"
+        elif not rel_path:
+            result.update(
+                status="missing", path=image_url, reason="Could not parse URL"
+            )
+        elif resolved[i] is not None:
+            result.update(
+                status="found", path=rel_path, resolved=resolved[i], match="exact"
+            )
+        else:
+            result["path"] = rel_path
+            resolve_missing(
+                result,
+                rel_path,
+                available_files,
+                uploads_path,
+                fuzzy_index,
+                fuzzy_threshold,
+            )
+        yield result
+
+
+def validate_results(results, uploads_path):
+    """
+    Mark found/fixable results whose file fails the integrity check as
+    corrupt. Formats the check has no markers for are left as they are,
+    with verified=False.
+    """
+
+    def matched_file(result):
+        if result["status"] == "found":
+            filepath = result["resolved"]
+        elif result["status"] == "fixable":
+            filepath = result["suggestion"]
+        else:
+            return None
+        result["verified"] = image_integrity.can_verify(filepath)
+        return uploads_path / filepath if result["verified"] else None
+
+    for result, reason in image_integrity.validate_stream(results, matched_file):
+        if reason:
+            if result["status"] == "fixable":
+                reason = f"Suggested fix is {reason}"
+            result.update(status="corrupt", reason=reason)
+        yield result
+
+
+REPORT_FIELDS = [
+    "row",
+    "sku",
+    "name",
+    "status",
+    "url",
+    "path",
+    "resolved",
+    "suggestion",
+    "match",
+    "score",
+    "webp",
+    "reason",
+    "verified",
+]
+
+
+class ReportWriter:
+    """Streams one record per checked row to a JSONL or CSV file."""
+
+    def __init__(self, path, fmt=None):
+        self.path = Path(path)
+        self.format = fmt or ("csv" if self.path.suffix.lower() == ".csv" else "jsonl")
+        self.file = open(self.path, "w", encoding="utf-8", newline="")
+        self.count = 0
+        if self.format == "csv":
+            self.writer = csv.DictWriter(
+                self.file, fieldnames=REPORT_FIELDS, extrasaction="ignore"
+            )
+            self.writer.writeheader()
+
+    def write(self, result):
+        if self.format == "csv":
+            self.writer.writerow(result)
+        else:
+            record = {field: result.get(field) for field in REPORT_FIELDS}
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sniff_delimiter(csv_path):
+    """Detect the CSV delimiter from the first 4 KB."""
+    with open(csv_path, "r", encoding="utf-8-sig") as f:
+        return csv.Sniffer().sniff(f.read(4096)).delimiter
+
+
+def split_image_urls(cell):
+    """Split a WooCommerce image cell (comma-separated URLs) into URLs."""
+    return [url.strip() for url in (cell or "").split(",") if url.strip()]
+
+
+def check_remote_images(args, csv_path, products, image_column):
+    """Verify every CSV image URL against the live host/CDN (--remote mode)."""
+    from . import remote_check
+
+    # Remote defaults live in remote_check so --help doesn't import asyncio
+    for option, default in [
+        ("concurrency", remote_check.DEFAULT_CONCURRENCY),
+        ("per_host", remote_check.DEFAULT_PER_HOST),
+        ("timeout", remote_check.DEFAULT_TIMEOUT),
+        ("cache_ttl", remote_check.DEFAULT_TTL_HOURS),
+    ]:
+        if getattr(args, option) is None:
+            setattr(args, option, default)
+
+    print("\n" + "=" * 70)
+    print("CHECKING REMOTE IMAGES")
+    print("=" * 70)
+
+    base = urlparse(args.remote_base) if args.remote_base else None
+    url_products = defaultdict(list)
+    checks = []
+    for i, product in enumerate(products):
+        product_name = product.get("Name", product.get("name", f"Row {i + 1}"))
+        sku = product.get("SKU", product.get("sku", ""))
+        for url in split_image_urls(product.get(image_column, "")):
+            if base:
+                parsed = urlparse(url)._replace(scheme=base.scheme, netloc=base.netloc)
+                url = urlunparse(parsed)
+            url_products[url].append((sku, product_name))
+            checks.append((i, sku, product_name, url))
+
+    cache_path = args.url_cache or csv_path.parent / "remote_url_cache.json"
+    print(f"\n  Checking {len(url_products)} unique URLs")
+    print(
+        f"  Concurrency: {args.concurrency} total, {args.per_host} per host,"
+        f" timeout {args.timeout:g}s"
+    )
+
+    start = time.perf_counter()
+    results, cache_hits = remote_check.verify_urls(
+        url_products,
+        cache_path=cache_path,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        timeout=args.timeout,
+        ttl_hours=args.cache_ttl,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"  Done in {elapsed:.1f}s ({cache_hits} from cache: {cache_path})")
+
+    if args.report:
+        # One record per product image URL, in CSV order
+        with ReportWriter(args.report, args.report_format) as report:
+            for i, sku, name, url in checks:
+                remote = results[url]
+                result = new_result(i, sku, name, url)
+                result.update(
+                    status="found" if remote["ok"] else "missing",
+                    resolved=remote["final_url"] if remote["ok"] else None,
+                    reason=remote["error"],
+                )
+                report.write(result)
+        print(f"  Report: {report.count} rows written to {report.path}")
+
+    ok = [r for r in results.values() if r["ok"]]
+    broken = [r for r in results.values() if not r["ok"]]
+    redirected = [r for r in ok if r["final_url"] != r["url"]]
+
+    print(f"\n RESULTS:")
+    print(f"  OK:                 {len(ok)}")
+    print(f"    - Redirected:     {len(redirected)}")
+    print(f"  Broken:             {len(broken)}")
+
+    if broken:
+        print(f"\n BROKEN URLS ({len(broken)}):")
+        print("-" * 70)
+        for result in broken[:30]:
+            sku, name = url_products[result["url"]][0]
+            print(f"  [{sku}] {name[:40]}")
+            print(f"         URL: {result['url']}")
+            print(f"         Reason: {result['error']}")
+        if len(broken) > 30:
+            print(f"  ... and {len(broken) - 30} more")
+
+    return 1 if broken else 0
+
+
+def main(argv=None, prog=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Check CSV images against uploads folder"
+    )
+    parser.add_argument("csv_path", help="Path to WooCommerce products CSV")
+    parser.add_argument(
+        "uploads_path",
+        nargs="?",
+        help="Path to uploads-originals folder (not needed with --remote)",
+    )
+    parser.add_argument(
+        "--fix", action="store_true", help="Generate fixed CSV with corrected paths"
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Show detailed output"
+    )
+    parser.add_argument(
+        "--rewrite",
+        action="append",
+        metavar="OLD=NEW",
+        help="With --fix: rewrite a host or URL prefix in every image URL (repeatable)",
+    )
+    parser.add_argument(
+        "--rewrite-file",
+        help="With --fix: file of OLD=NEW rewrite rules, one per line",
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Search all folders for renamed files when no same-folder match exists",
+    )
+    parser.add_argument(
+        "--fuzzy-threshold",
+        type=float,
+        default=DEFAULT_AUTOFIX_THRESHOLD,
+        help=f"Minimum fuzzy score (0-1) to treat a match as fixable (default: {DEFAULT_AUTOFIX_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check matched files for truncation/corruption (header and trailer markers)",
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Find visually identical/near-identical product images (needs Pillow)",
+    )
+    parser.add_argument(
+        "--duplicate-distance",
+        type=int,
+        default=image_hashes.DEFAULT_MAX_DISTANCE,
+        help=f"Max differing hash bits (of 64) for near-duplicates (default: {image_hashes.DEFAULT_MAX_DISTANCE})",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        help="Perceptual hash cache file (default: image_hashes.json next to the CSV)",
+    )
+    parser.add_argument(
+        "--remote",
+        action="store_true",
+        help="Verify image URLs against the live host/CDN instead of a local folder",
+    )
+    parser.add_argument(
+        "--remote-base",
+        help="Check URLs against this scheme://host instead (e.g. a CDN or local server)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Max simultaneous remote requests (default: 50)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        help="Max connections per host (default: 8)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="Per-request timeout in seconds (default: 15)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Hours before a cached URL result is rechecked (default: 24)",
+    )
+    parser.add_argument(
+        "--url-cache",
+        help="Remote result cache file (default: remote_url_cache.json next to the CSV)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["rows", "columnar"],
+        default="rows",
+        help="rows: check row by row; columnar: bulk-resolve paths (pyarrow if installed)",
+    )
+    parser.add_argument(
+        "--report",
+        help="Write every result row to this file (.jsonl or .csv), streamed as checked;"
+        " with --remote, one row per image URL",
+    )
+    parser.add_argument(
+        "--report-format",
+        choices=["jsonl", "csv"],
+        help="Report format (default: from the --report file extension)",
+    )
+
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=DEFAULT_WALK_WORKERS,
+        help="Folders listed in parallel while scanning uploads; raise it for "
+        f"network mounts, 1 lists one at a time (default: {DEFAULT_WALK_WORKERS})",
+    )
+    instrument.add_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if not 0 <= args.fuzzy_threshold <= 1:
+        parser.error("--fuzzy-threshold must be between 0 and 1")
+    if not args.uploads_path and not args.remote:
+        parser.error("uploads_path is required unless --remote is used")
+    if args.remote:
+        # These all work on files in uploads_path, which --remote doesn't read
+        local_only = [
+            option
+            for option, used in [
+                ("--fix", args.fix),
+                ("--fuzzy", args.fuzzy),
+                ("--validate", args.validate),
+                ("--duplicates", args.duplicates),
+            ]
+            if used
+        ]
+        if local_only:
+            parser.error(f"{', '.join(local_only)} can't be used with --remote")
+
+    rewrite_rules = None
+    if args.rewrite or args.rewrite_file:
+        if not args.fix:
+            parser.error("--rewrite and --rewrite-file need --fix")
+        try:
+            rules = [parse_rule(rule) for rule in args.rewrite or []]
+            if args.rewrite_file:
+                rules += read_rules_file(args.rewrite_file)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        rewrite_rules = RewriteRules(rules)
+
+    return instrument.run(
+        "check", args, lambda timer: run_check(args, rewrite_rules, timer)
+    )
+
+
+def run_check(args, rewrite_rules, timer):
+    """Run the check for parsed args, timing each phase on timer."""
+    csv_path = Path(args.csv_path)
+    uploads_path = Path(args.uploads_path) if args.uploads_path else None
+
+    if not csv_path.exists():
+        print(f"Error: CSV not found: {csv_path}")
+        return 1
+
+    if not args.remote and not uploads_path.exists():
+        print(f"Error: Uploads folder not found: {uploads_path}")
+        return 1
+
+    print("=" * 70)
+    print("CSV Image Checker for WooCommerce Import")
+    print("=" * 70)
+
+    fuzzy_index = None
+    if not args.remote:
+        # Scan uploads folder
+        print(f"\nScanning uploads folder: {uploads_path}")
+        with timer.phase("scan") as phase:
+            available_files = scan_uploads_folder(uploads_path, args.scan_workers)
+            phase["files"] = len(available_files)
+        print(f"  Found {len(available_files)} files")
+
+        if args.fuzzy:
+            with timer.phase("fuzzy_index"):
+                # One image file per upload: no thumbnails, WebP copies or non-images
+                fuzzy_index = TrigramIndex(available_files.variants().representatives())
+            print(f"  Fuzzy index: {len(fuzzy_index)} filenames")
+
+    # Read CSV and extract image URLs
+    print(f"\nReading CSV: {csv_path}")
+
+    # Try to detect delimiter
+    delimiter = sniff_delimiter(csv_path)
+
+    image_column = None
+
+    with timer.phase("read_csv") as phase:
+        if args.engine == "columnar":
+            products = columnar_check.read_table(csv_path, delimiter)
+            fieldnames = products.fieldnames
+            backend = "pyarrow" if products.arrow_table is not None else "csv module"
+            print(f"  Engine: columnar ({backend})")
+        else:
+            with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+                reader = csv.DictReader(f, delimiter=delimiter)
+                fieldnames = reader.fieldnames
+                products = list(reader)
+        phase["rows"] = len(products)
+
+    # Find image column
+    for col in fieldnames:
+        if "image" in col.lower():
+            image_column = col
+            break
+
+    if not image_column:
+        print("  Error: No image column found in CSV")
+        print(f"  Columns: {fieldnames}")
+        return 1
+
+    print(f"  Image column: '{image_column}'")
+    print(f"  Found {len(products)} products")
+
+    if args.remote:
+        with timer.phase("remote"):
+            return check_remote_images(args, csv_path, products, image_column)
+
+    # Check each image
+    print("\n" + "=" * 70)
+    print("CHECKING IMAGES")
+    print("=" * 70)
+
+    found = []
+    missing = []
+    empty = []
+    webp_issues = []
+    fixable = []
+    corrupt = []
+    unverified = 0
+    fuzzy_fixed = 0
+
+    check = check_rows_columnar if args.engine == "columnar" else check_rows
+    results = check(
+        products,
+        image_column,
+        available_files,
+        uploads_path,
+        fuzzy_index,
+        args.fuzzy_threshold,
+    )
+    if args.validate:
+        # Validate every matched file: direct hits and suggested replacements
+        results = validate_results(results, uploads_path)
+
+    report = None
+    if args.report:
+        report = ReportWriter(args.report, args.report_format)
+
+    start = time.perf_counter()
+    with timer.phase("check", rows=len(products)), instrument.Progress(
+        "Checking", total=len(products), unit="rows"
+    ) as progress:
+        try:
+            for result in results:
+                sku, name, path = result["sku"], result["name"], result["path"]
+                status = result["status"]
+
+                if status == "found":
+                    found.append((sku, name, path))
+                elif status == "empty":
+                    empty.append((sku, name))
+                elif status == "missing":
+                    missing.append((sku, name, path, result["reason"]))
+                elif status == "fixable":
+                    fixable.append(
+                        (sku, name, path, result["suggestion"], result["url"])
+                    )
+                    if result["match"] == "fuzzy":
+                        fuzzy_fixed += 1
+                elif status == "corrupt":
+                    corrupt.append((sku, name, path, result["reason"]))
+
+                # A corrupt row is already counted as an issue
+                if result["webp"] and status != "corrupt":
+                    webp_issues.append((sku, name, path))
+                if result["verified"] is False:
+                    unverified += 1
+
+                if report:
+                    report.write(result)
+                progress.update()
+        finally:
+            if report:
+                report.close()
+    elapsed = time.perf_counter() - start
+
+    if args.validate:
+        print(f"\n  Checked and validated {len(products)} rows in {elapsed:.2f}s")
+
+    # Print results
+    print(f"\n RESULTS:")
+    print(f"  Found:              {len(found)}")
+    print(f"  Missing:            {len(missing)}")
+    print(f"  Empty (no image):   {len(empty)}")
+    print(f"  WebP references:    {len(webp_issues)}")
+    print(f"  Fixable:            {len(fixable)}")
+    if fuzzy_index is not None:
+        print(f"    - Fuzzy matches:  {fuzzy_fixed}")
+    if args.validate:
+        print(f"  Corrupt:            {len(corrupt)}")
+        if unverified:
+            print(f"  Unverified:         {unverified} (format has no integrity check)")
+
+    if corrupt:
+        print(f"\n CORRUPT IMAGES ({len(corrupt)}):")
+        print("-" * 70)
+        for sku, name, path, reason in corrupt[:30]:
+            print(f"  [{sku}] {name[:40]}")
+            print(f"         Path: {path}")
+            print(f"         Reason: {reason}")
+        if len(corrupt) > 30:
+            print(f"  ... and {len(corrupt) - 30} more")
+
+    if missing and args.verbose:
+        print(f"\n MISSING IMAGES ({len(missing)}):")
+        print("-" * 70)
+        for sku, name, path, reason in missing[:30]:
+            print(f"  [{sku}] {name[:40]}")
+            print(f"         Path: {path}")
+            print(f"         Reason: {reason}")
+        if len(missing) > 30:
+            print(f"  ... and {len(missing) - 30} more")
+
+    if webp_issues:
+        print(f"\n WEBP REFERENCES ({len(webp_issues)}):")
+        print("-" * 70)
+        print("  These reference .webp files but we only extracted jpg/png originals.")
+        print("  The original jpg/png might exist - checking...")
+
+        webp_fixable = 0
+        for sku, name, path in webp_issues[:10]:
+            # Check for jpg/png version
+            base = path.rsplit(".", 1)[0]
+            for ext in [".jpg", ".jpeg", ".png"]:
+                test_path = base + ext
+                if test_path.lower() in available_files:
+                    print(f"  [{sku}] {path}")
+                    print(f"         -> Found: {available_files[test_path.lower()]}")
+                    webp_fixable += 1
+                    break
+
+        if webp_fixable > 0:
+            print(
+                f"\n  {webp_fixable} WebP references can be fixed by using jpg/png instead"
+            )
+
+    if fixable:
+        print(f"\n FIXABLE ({len(fixable)}):")
+        print("-" * 70)
+        for sku, name, old_path, new_path, url in fixable[:20]:
+            print(f"  [{sku}] {name[:40]}")
+            print(f"         CSV:   {old_path}")
+            print(f"         Found: {new_path}")
+        if len(fixable) > 20:
+            print(f"  ... and {len(fixable) - 20} more")
+
+    if args.duplicates and found:
+        print(f"\n DUPLICATE IMAGES:")
+        print("-" * 70)
+
+        # Products referencing each upload (several products may share one file)
+        references = defaultdict(list)
+        for sku, name, path in found:
+            references[available_files[path.lower()]].append(sku or name)
+
+        hash_cache = args.hash_cache or csv_path.parent / "image_hashes.json"
+        try:
+            with timer.phase("hash", files=len(references)):
+                hashes, hash_errors, cache_hits = image_hashes.compute_hashes(
+                    references, uploads_path, cache_path=hash_cache
+                )
+        except RuntimeError as e:
+            print(f"  Skipped: {e}")
+        else:
+            print(
+                f"  Hashed {len(hashes)} images ({cache_hits} from cache: {hash_cache})"
+            )
+            if hash_errors:
+                print(f"  Could not hash {len(hash_errors)} images")
+
+            clusters = image_hashes.find_clusters(hashes, args.duplicate_distance)
+            clustered = {path for cluster in clusters for path in cluster}
+            clusters += [
+                [path]
+                for path in sorted(references)
+                if path not in clustered and len(references[path]) > 1
+            ]
+            clusters.sort(key=lambda c: -sum(len(references[path]) for path in c))
+
+            print(f"  Duplicate groups:   {len(clusters)}")
+            for cluster in clusters[:10]:
+                product_count = sum(len(references[path]) for path in cluster)
+                print(f"  {product_count} products share {len(cluster)} file(s):")
+                for path in cluster[:5]:
+                    print(f"         {path} ({len(references[path])} products)")
+                if len(cluster) > 5:
+                    print(f"         ... and {len(cluster) - 5} more files")
+            if len(clusters) > 10:
+                print(f"  ... and {len(clusters) - 10} more groups")
+
+    # Generate fixed CSV if requested
+    if args.fix and (fixable or webp_issues or rewrite_rules):
+        print("\n" + "=" * 70)
+        print("GENERATING FIXED CSV")
+        print("=" * 70)
+
+        # Build replacement map
+        replacements = {}
+
+        # Add fixable paths
+        for sku, name, old_path, new_path, old_url in fixable:
+            # Build new URL from old URL structure
+            new_url = old_url.replace(old_path, new_path)
+            replacements[old_url] = new_url
+
+        # Add WebP -> jpg/png fixes
+        for sku, name, path in webp_issues:
+            base = path.rsplit(".", 1)[0]
+            for ext in [".jpg", ".jpeg", ".png"]:
+                test_path = base + ext
+                if test_path.lower() in available_files:
+                    actual_path = available_files[test_path.lower()]
+                    # Find original URL for this product
+                    for product in products:
+                        if product.get("SKU", product.get("sku", "")) == sku:
+                            old_url = product.get(image_column, "")
+                            new_url = old_url.rsplit(".", 1)[0] + ext
+                            replacements[old_url] = new_url
+                            break
+                    break
+
+        # Write fixed CSV
+        fixed_csv_path = csv_path.parent / (csv_path.stem + "_fixed" + csv_path.suffix)
+
+        fixes_applied = 0
+        rows_rewritten = 0
+        with timer.phase("write_csv", rows=len(products)), open(
+            csv_path, "r", encoding="utf-8-sig", newline=""
+        ) as f_in:
+            with open(fixed_csv_path, "w", encoding="utf-8", newline="") as f_out:
+                reader = csv.DictReader(f_in, delimiter=delimiter)
+                writer = csv.DictWriter(
+                    f_out, fieldnames=reader.fieldnames, delimiter=delimiter
+                )
+                writer.writeheader()
+                image_columns = [c for c in reader.fieldnames if "image" in c.lower()]
+
+                for row in reader:
+                    old_url = row.get(image_column, "")
+                    if old_url in replacements:
+                        row[image_column] = replacements[old_url]
+                        fixes_applied += 1
+                    if rewrite_rules:
+                        # Host/prefix rules apply on top of the path fixes
+                        rewritten = False
+                        for column in image_columns:
+                            cell = row[column]
+                            row[column] = rewrite_rules.rewrite_cell(cell)
+                            rewritten = rewritten or row[column] != cell
+                        rows_rewritten += rewritten
+                    writer.writerow(row)
+
+        print(f"  Fixed CSV saved to: {fixed_csv_path}")
+        print(f"  Fixes applied: {fixes_applied}")
+        if rewrite_rules:
+            print(f"  Rows rewritten: {rows_rewritten}")
+            for old, new, count in rewrite_rules.summary():
+                print(f"    {old} -> {new}: {count} URLs")
+
+    if report:
+        print(f"\n  Report: {report.count} rows written to {report.path}")
+
+    # Summary
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    total = len(products)
+    ok = len(found)
+    problems = len(missing) + len(webp_issues) + len(corrupt)
+
+    print(f"  Total products:     {total}")
+    print(f"  Images OK:          {ok} ({ok * 100 // total}%)")
+    print(f"  Issues:             {problems} ({problems * 100 // total}%)")
+
+    if problems > 0:
+        print(f"\n  To generate a fixed CSV, run with --fix flag:")
+        print(f'    python check_csv_images.py "{csv_path}" "{uploads_path}" --fix')
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
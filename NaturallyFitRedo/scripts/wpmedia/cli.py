@@ -0,0 +1,46 @@
+"""
+wpmedia Command Line
+====================
+One entry point with a subcommand per tool. Each tool module is imported only
+when its subcommand runs, so `python -m wpmedia --help` starts instantly.
+"""
+
+import importlib
+import sys
+
+# subcommand: (module, description)
+COMMANDS = {
+    "check": ("wpmedia.check", "Check CSV image URLs against uploads or the live site"),
+    "extract": ("wpmedia.extract", "Copy original images out of an uploads folder"),
+    "reconcile": (
+        "wpmedia.reconcile",
+        "Join product sitemap, CSV and uploads; find orphans",
+    ),
+    "catalog": ("wpmedia.catalog", "Keep a SQLite catalog of an uploads folder"),
+    "benchmark": ("wpmedia.benchmark", "Time the checker on synthetic uploads trees"),
+}
+
+
+def print_usage(prog):
+    print(f"usage: {prog} <command> [options]")
+    print("\ncommands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<11}{description}")
+    print(f"\nRun '{prog} <command> --help' for a command's options.")
+
+
+def main(argv=None, prog="wpmedia"):
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage(prog)
+        return 0
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print_usage(prog)
+        print(f"\nError: unknown command '{command}'")
+        return 2
+
+    module = importlib.import_module(COMMANDS[command][0])
+    return module.main(args, prog=f"{prog} {command}")
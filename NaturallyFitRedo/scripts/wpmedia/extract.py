@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Extract Original Images from WordPress Uploads
+===============================================
+This script scans a WordPress wp-content/uploads folder and copies ONLY
+the original uploaded images, skipping all auto-generated thumbnails and WebP files.
+
+WordPress auto-generates files like:
+  - product-image-150x150.jpg (thumbnail)
+  - product-image-300x300.jpg (medium)
+  - product-image-768x768.jpg (medium-large)
+  - product-image-1024x1024.jpg (large)
+  - product-image.webp (WebP conversion)
+  - product-image-150x150.webp (WebP thumbnail)
+  - etc.
+
+This script keeps ONLY the original: product-image.jpg
+
+Usage:
+  python extract_original_images.py "C:/path/to/uploads" "C:/path/to/output"
+  python -m wpmedia extract "C:/path/to/uploads" "C:/path/to/output"
+
+Optional flags:
+  --flatten         Put all images in one folder (no year/month structure)
+  --dry-run         Show what would be copied without copying
+  --include-webp    Also copy original WebP files (not just jpg/png)
+  --csv FILE ...    Only copy images referenced by these product CSVs
+  --scan-workers N  Folders listed in parallel (raise for SMB/NFS mounts)
+  --timings FILE    Per-phase wall/CPU times, also saved as JSON
+  --profile FILE    Save cProfile stats for the run
+"""
+
+import csv
+import shutil
+import argparse
+import posixpath
+from pathlib import Path
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from . import instrument
+from .check import extract_image_path, sniff_delimiter, split_image_urls
+from .rules import IMAGE_EXTENSIONS, WEBP_EXTENSION, is_scaled, is_thumbnail
+from .uploads import DEFAULT_WALK_WORKERS, load_index
+from .variants import ORIGINAL, classify
+
+DEFAULT_COPY_WORKERS = 8
+
+
+def scan_uploads(uploads_path, include_webp=False, workers=None):
+    """
+    Scan uploads folder and return dict of original images. When an image's
+    original is gone, its best surviving variant (-scaled, else the largest
+    -WxH size) is returned in its place.
+    Returns: ({relative_path: absolute_path}, thumbnails_skipped, webp_skipped,
+    fallbacks), relative paths using "/"
+    """
+    index = load_index(uploads_path, workers=workers)
+    stand_ins = index.variants().fallbacks(include_webp=include_webp)
+    originals = {}
+    thumbnails_skipped = 0
+    webp_skipped = 0
+
+    valid_extensions = IMAGE_EXTENSIONS.copy()
+    if include_webp:
+        valid_extensions.update(WEBP_EXTENSION)
+
+    for number, rel_path in enumerate(index):
+        filename = rel_path.rsplit("/", 1)[-1]
+        ext = Path(filename).suffix.lower()
+
+        # Skip non-image files
+        if ext not in valid_extensions and ext not in WEBP_EXTENSION:
+            continue
+
+        # Original missing: this variant is the best copy left
+        if number in stand_ins:
+            originals[rel_path] = str(index.abs_path(rel_path))
+            continue
+
+        # Skip WebP files unless explicitly included
+        if ext in WEBP_EXTENSION and not include_webp:
+            webp_skipped += 1
+            continue
+
+        # Skip thumbnails
+        if is_thumbnail(filename):
+            thumbnails_skipped += 1
+            continue
+
+        # Skip scaled versions (keep original instead if it exists)
+        if is_scaled(filename):
+            thumbnails_skipped += 1
+            continue
+
+        # This is an original image
+        originals[rel_path] = str(index.abs_path(rel_path))
+
+    return originals, thumbnails_skipped, webp_skipped, len(stand_ins)
+
+
+def select_referenced(csv_paths, uploads_path, include_webp=False):
+    """
+    Images used by the product CSVs (every image column). Each URL that
+    resolves to an upload, or to a size of one that is gone, selects its
+    original, or the best variant of the same file type left when the
+    original is gone; each file is selected once.
+    Returns: ({relative_path: absolute_path}, stats)
+    """
+    index = load_index(uploads_path)
+    variants = index.variants()
+    selected = {}
+    stats = {"urls": 0, "unresolved": 0, "fallbacks": 0}
+
+    for csv_path in csv_paths:
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f, delimiter=sniff_delimiter(csv_path))
+            image_columns = [c for c in reader.fieldnames if "image" in c.lower()]
+            for row in reader:
+                for column in image_columns:
+                    for url in split_image_urls(row.get(column)):
+                        stats["urls"] += 1
+                        rel_path = extract_image_path(url)
+                        if not rel_path:
+                            stats["unresolved"] += 1
+                            continue
+                        # The URL's own file may be gone while its original
+                        # or another size survives; a referenced WebP still
+                        # ships if it's all that's left
+                        resolved = index.get(rel_path.lower())
+                        lookup = resolved or rel_path
+                        best = (
+                            variants.best(lookup, include_webp)
+                            or variants.best(lookup, True)
+                            or resolved
+                        )
+                        if best is None:
+                            stats["unresolved"] += 1
+                            continue
+                        # Each file once, however many URLs lead to it
+                        if best in selected:
+                            continue
+                        # Non-image uploads (SVG, PDF) are copied as-is
+                        info = classify(posixpath.basename(best))
+                        if info is not None and info[0] != ORIGINAL:
+                            stats["fallbacks"] += 1
+                        selected[best] = str(index.abs_path(best))
+
+    return selected, stats
+
+
+def flatten_names(rel_paths):
+    """
+    Output filename for every file when flattening into one folder. A name
+    no other file uses (ignoring case) is kept; files sharing a name all get
+    their folder prepended ("2024_05_photo.jpg"), and anything still taken
+    gets -2, -3, ... in sorted path order. The result depends only on the
+    set of paths, never on copy order or what is already on disk.
+    Returns: {rel_path: filename}
+    """
+    rel_paths = sorted(rel_paths)
+    shared = Counter(posixpath.basename(rel_path).lower() for rel_path in rel_paths)
+    candidates = {}
+    for rel_path in rel_paths:
+        name = posixpath.basename(rel_path)
+        candidates[rel_path] = (
+            name if shared[name.lower()] == 1 else rel_path.replace("/", "_")
+        )
+
+    # A prefixed name can still meet a plain one ("2024_05_a.jpg" vs "2024/05/a.jpg")
+    reserved = {name.lower() for name in candidates.values()}
+    taken = set()
+    names = {}
+    for rel_path in rel_paths:
+        name = candidates[rel_path]
+        if name.lower() in taken:
+            stem, ext = posixpath.splitext(name)
+            number = 2
+            while f"{stem}-{number}{ext}".lower() in reserved:
+                number += 1
+            name = f"{stem}-{number}{ext}"
+            reserved.add(name.lower())
+        taken.add(name.lower())
+        names[rel_path] = name
+    return names
+
+
+def copy_images(
+    originals,
+    output_path,
+    flatten=False,
+    dry_run=False,
+    workers=DEFAULT_COPY_WORKERS,
+    sizes=None,
+):
+    """
+    Copy original images to output folder (copies run on a thread pool).
+    sizes ({rel_path: bytes}, optional) feeds the MB/s and ETA of the
+    progress line.
+    """
+    output_path = Path(output_path)
+    errors = []
+
+    # Plan every destination first, so parallel copies can't race on names
+    flat_names = flatten_names(originals) if flatten else None
+    planned = []
+    for rel_path, abs_path in originals.items():
+        if flatten:
+            # Put all files in root of output, each under its own name
+            dest = output_path / flat_names[rel_path]
+        else:
+            # Preserve year/month structure
+            dest = output_path / rel_path
+        planned.append((rel_path, abs_path, dest))
+
+    if dry_run:
+        for rel_path, _, _ in planned:
+            print(f"  Would copy: {rel_path}")
+        return 0, errors
+
+    for folder in {dest.parent for _, _, dest in planned}:
+        folder.mkdir(parents=True, exist_ok=True)
+
+    def copy_one(item):
+        rel_path, abs_path, dest = item
+        try:
+            shutil.copy2(abs_path, dest)
+            return None
+        except Exception as e:
+            return (rel_path, str(e))
+
+    sizes = sizes or {}
+    total_bytes = sum(sizes.get(rel_path, 0) for rel_path, _, _ in planned)
+    with ThreadPoolExecutor(max_workers=workers) as pool, instrument.Progress(
+        "Copying", total=len(planned), total_bytes=total_bytes
+    ) as progress:
+        for (rel_path, _, _), error in zip(planned, pool.map(copy_one, planned)):
+            if error:
+                errors.append(error)
+            progress.update(1, sizes.get(rel_path, 0))
+
+    return len(planned) - len(errors), errors
+
+
+def analyze_folder(uploads_path, workers=None):
+    """Analyze uploads folder and print statistics."""
+    stats = {
+        "total_files": 0,
+        "total_size": 0,
+        "images": 0,
+        "thumbnails": 0,
+        "webp": 0,
+        "originals": 0,
+        "original_size": 0,
+        "by_year": defaultdict(int),
+        "by_extension": defaultdict(int),
+    }
+
+    for rel_path, size in load_index(
+        uploads_path, with_sizes=True, workers=workers
+    ).with_sizes():
+        parts = rel_path.split("/")
+        filename = parts[-1]
+        ext = Path(filename).suffix.lower()
+
+        stats["total_files"] += 1
+        stats["total_size"] += size
+        stats["by_extension"][ext] += 1
+
+        # Track by year
+        if len(parts) >= 1 and parts[0].isdigit():
+            stats["by_year"][parts[0]] += 1
+
+        if ext in IMAGE_EXTENSIONS or ext in WEBP_EXTENSION:
+            stats["images"] += 1
+
+            if ext in WEBP_EXTENSION:
+                stats["webp"] += 1
+            elif is_thumbnail(filename) or is_scaled(filename):
+                stats["thumbnails"] += 1
+            else:
+                stats["originals"] += 1
+                stats["original_size"] += size
+
+    return stats
+
+
+def format_size(size_bytes):
+    """Format bytes to human readable size."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f} TB"
+
+
+def print_analysis(stats):
+    """Print analyze_folder() statistics."""
+    print("FOLDER ANALYSIS:")
+    print("-" * 40)
+    print(f"  Total files:        {stats['total_files']:,}")
+    print(f"  Total size:         {format_size(stats['total_size'])}")
+    print(f"  Image files:        {stats['images']:,}")
+    print(f"    - Thumbnails:     {stats['thumbnails']:,} (will skip)")
+    print(f"    - WebP files:     {stats['webp']:,} (will skip)")
+    print(f"    - ORIGINALS:      {stats['originals']:,} (will copy)")
+    print(f"  Original size:      {format_size(stats['original_size'])}")
+
+    if stats["by_year"]:
+        print(f"\n  Files by year:")
+        for year in sorted(stats["by_year"].keys()):
+            print(f"    {year}: {stats['by_year'][year]:,} files")
+
+    reduction = (
+        (1 - stats["original_size"] / stats["total_size"]) * 100
+        if stats["total_size"] > 0
+        else 0
+    )
+    print(f"\n  Size reduction:     {reduction:.1f}%")
+    print(
+        f"  ({format_size(stats['total_size'])} -> {format_size(stats['original_size'])})"
+    )
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Extract original images from WordPress uploads folder"
+    )
+    parser.add_argument("uploads_path", help="Path to wp-content/uploads folder")
+    parser.add_argument("output_path", nargs="?", help="Output folder for originals")
+    parser.add_argument(
+        "--flatten",
+        action="store_true",
+        help="Put all images in one folder (no year/month structure)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be copied without copying",
+    )
+    parser.add_argument(
+        "--include-webp", action="store_true", help="Also copy original WebP files"
+    )
+    parser.add_argument(
+        "--analyze", action="store_true", help="Only analyze folder, don't copy"
+    )
+    parser.add_argument(
+        "--csv",
+        nargs="+",
+        metavar="CSV",
+        help="Only copy images referenced by these product CSVs (plus fallbacks)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_COPY_WORKERS,
+        help=f"Parallel copy threads (default: {DEFAULT_COPY_WORKERS})",
+    )
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=DEFAULT_WALK_WORKERS,
+        help="Folders listed in parallel while scanning uploads; raise it for "
+        f"network mounts, 1 lists one at a time (default: {DEFAULT_WALK_WORKERS})",
+    )
+    instrument.add_arguments(parser)
+
+    args = parser.parse_args(argv)
+    return instrument.run("extract", args, lambda timer: run_extract(args, timer))
+
+
+def run_extract(args, timer):
+    """Run the extraction for parsed args, timing each phase on timer."""
+    uploads_path = Path(args.uploads_path)
+
+    if not uploads_path.exists():
+        print(f"Error: Uploads folder not found: {uploads_path}")
+        return 1
+
+    print("=" * 60)
+    print("WordPress Uploads - Original Image Extractor")
+    print("=" * 60)
+    print(f"\nScanning: {uploads_path}\n")
+
+    # Analyze folder
+    with timer.phase("scan") as phase:
+        stats = analyze_folder(uploads_path, args.scan_workers)
+        phase["files"] = stats["total_files"]
+
+    print_analysis(stats)
+
+    if args.analyze:
+        print("\n[Analyze only mode - no files copied]")
+        return 0
+
+    if not args.output_path:
+        print("\nTo extract originals, run with output path:")
+        print(
+            f'  python extract_original_images.py "{uploads_path}" "C:/path/to/output"'
+        )
+        print("\nOptions:")
+        print("  --flatten      Put all images in one folder")
+        print("  --dry-run      Preview without copying")
+        print("  --include-webp Also copy WebP originals")
+        return 0
+
+    output_path = Path(args.output_path)
+    # Stat'ed once by the analysis walk
+    sizes = dict(load_index(uploads_path, with_sizes=True).with_sizes())
+
+    print("\n" + "=" * 60)
+    print("EXTRACTING ORIGINAL IMAGES")
+    print("=" * 60)
+
+    if args.csv:
+        # Only what the product CSVs use
+        print(f"\nFinding images referenced by {len(args.csv)} CSV file(s)...")
+        with timer.phase("select"):
+            originals, ref_stats = select_referenced(
+                args.csv,
+                uploads_path,
+                include_webp=args.include_webp,
+            )
+        selected_size = sum(sizes[rel_path] for rel_path in originals)
+
+        print(f"  Image URLs:         {ref_stats['urls']:,}")
+        print(f"  Not in uploads:     {ref_stats['unresolved']:,}")
+        print(f"  Selected:           {len(originals):,} files")
+        print(f"    - Variant fallbacks: {ref_stats['fallbacks']:,} (original missing)")
+        print(
+            f"  Selected size:      {format_size(selected_size)}"
+            f" (all originals: {format_size(stats['original_size'])})"
+        )
+    else:
+        # Scan for originals
+        print("\nFinding original images...")
+        with timer.phase("select"):
+            originals, thumb_skip, webp_skip, fallbacks = scan_uploads(
+                uploads_path, include_webp=args.include_webp, workers=args.scan_workers
+            )
+
+        print(f"  Found {len(originals):,} original images")
+        if fallbacks:
+            print(f"    - {fallbacks:,} are the largest size left (original missing)")
+        print(f"  Skipping {thumb_skip:,} thumbnails")
+        print(f"  Skipping {webp_skip:,} WebP files")
+
+    if args.dry_run:
+        print(f"\n[DRY RUN - showing first 20 files]")
+        for i, rel_path in enumerate(list(originals.keys())[:20]):
+            print(f"  {rel_path}")
+        if len(originals) > 20:
+            print(f"  ... and {len(originals) - 20} more")
+        return 0
+
+    # Copy files
+    print(f"\nCopying to: {output_path}")
+    if args.flatten:
+        print("  Mode: Flattened (all files in one folder)")
+    else:
+        print("  Mode: Preserve year/month structure")
+
+    copy_bytes = sum(sizes[rel_path] for rel_path in originals)
+    with timer.phase("copy", files=len(originals), bytes=copy_bytes):
+        copied, errors = copy_images(
+            originals,
+            output_path,
+            flatten=args.flatten,
+            dry_run=args.dry_run,
+            workers=args.workers,
+            sizes=sizes,
+        )
+
+    print(f"\nDONE!")
+    print(f"  Copied: {copied:,} files")
+    if errors:
+        print(f"  Errors: {len(errors)}")
+        for path, err in errors[:5]:
+            print(f"    - {path}: {err}")
+
+    print(f"\nOriginal images saved to: {output_path}")
+    print("Upload this folder to your new WordPress site's wp-content/uploads/")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Trigram Fuzzy Matching for Upload Filenames
+============================================
+Builds an inverted index of character trigrams over every upload filename so
+that renamed or re-uploaded images (whey-protein.jpg -> whey-protein-2.jpg,
+possibly in another year/month folder) can be found without scanning the
+whole uploads tree for every missing CSV image.
+
+Candidates are scored with the Dice coefficient of their trigram sets:
+  score = 2 * |shared trigrams| / (|query trigrams| + |file trigrams|)
+
+A score of 1.0 means the normalized filenames are identical. Shared trigram
+counts are tallied in C (Counter over the chained posting lists) and only
+candidates that can still reach min_score are scored, so a lookup costs
+roughly the length of the posting lists it touches, not the size of the
+uploads tree.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from pathlib import PurePosixPath
+
+# Default minimum score for a fuzzy match to be applied automatically by --fix
+DEFAULT_AUTOFIX_THRESHOLD = 0.75
+
+# Candidates below this score are never reported, not even as hints
+MIN_REPORT_SCORE = 0.5
+
+# Separators WordPress leaves in slugs; collapsed so "whey_protein" == "whey-protein"
+SEPARATOR_PATTERN = re.compile(r"[\s\-_.+]+")
+
+
+def normalize_name(filename):
+    """Normalize a filename stem for trigram comparison."""
+    stem = PurePosixPath(filename.replace("\\", "/")).stem.lower()
+    return SEPARATOR_PATTERN.sub(" ", stem).strip()
+
+
+def trigrams(text):
+    """Return the set of padded character trigrams for normalized text."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over upload file paths."""
+
+    def __init__(self, paths=()):
+        self.paths = []
+        self.sizes = []
+        self.postings = defaultdict(list)
+        self._ids = {}
+        for path in paths:
+            self.add(path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, rel_path):
+        """Add a relative upload path to the index (duplicates are ignored)."""
+        if rel_path in self._ids:
+            return
+        file_id = len(self.paths)
+        grams = trigrams(normalize_name(rel_path))
+        self._ids[rel_path] = file_id
+        self.paths.append(rel_path)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(file_id)
+
+    def search(self, target_name, limit=5, min_score=MIN_REPORT_SCORE):
+        """
+        Find the best-matching upload paths for a filename.
+        Returns: [(score, rel_path), ...] sorted best first.
+
+        Ties are broken in favour of files in the same folder as the target,
+        then files with the same extension.
+        """
+        query = trigrams(normalize_name(target_name))
+        if not query or not self.paths:
+            return []
+
+        query_size = len(query)
+        min_score = max(min_score, 0.01)
+        min_shared = math.ceil(min_score * query_size / (2 - min_score))
+
+        shared = Counter(
+            chain.from_iterable(self.postings.get(gram, ()) for gram in query)
+        )
+
+        target = PurePosixPath(target_name.replace("\\", "/"))
+        target_dir = str(target.parent).lower()
+        target_ext = target.suffix.lower()
+
+        scored = []
+        for file_id, count in shared.items():
+            if count < min_shared:
+                continue
+            score = 2.0 * count / (query_size + self.sizes[file_id])
+            if score < min_score:
+                continue
+            path = PurePosixPath(self.paths[file_id])
+            same_dir = str(path.parent).lower() == target_dir
+            same_ext = path.suffix.lower() == target_ext
+            scored.append((score, same_dir, same_ext, self.paths[file_id]))
+
+        scored.sort(key=lambda item: (-item[0], not item[1], not item[2], item[3]))
+        return [(round(score, 3), path) for score, _, _, path in scored[:limit]]
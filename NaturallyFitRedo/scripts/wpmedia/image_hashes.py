@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Perceptual Hashing for Duplicate Product Images
+================================================
+Computes a 64-bit difference hash (dHash) for each image so that visually
+identical files - the same photo saved under a different name or size, or
+one placeholder reused by dozens of products - can be grouped together.
+
+  - Hashes are computed in a process pool (decoding is CPU bound)
+  - Results are cached by file size + mtime, so reruns only hash new files
+  - Near-duplicates are found with a BK-tree over Hamming distance
+
+Requires Pillow (pip install Pillow). Everything else is standard library.
+"""
+
+import json
+import os
+from pathlib import Path
+
+# dHash grid: (HASH_SIZE + 1) x HASH_SIZE greyscale pixels -> HASH_SIZE^2 bits
+HASH_SIZE = 8
+
+# Hamming distance (out of 64 bits) at or below which two images are near-duplicates
+DEFAULT_MAX_DISTANCE = 4
+
+CACHE_VERSION = 1
+
+
+def require_pillow():
+    """Import Pillow lazily so the checker still runs without it."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError(
+            "Pillow is required for perceptual hashing (pip install Pillow)"
+        )
+    return Image
+
+
+def dhash(filepath, hash_size=HASH_SIZE):
+    """Compute the difference hash of an image file as an int."""
+    Image = require_pillow()
+    with Image.open(filepath) as img:
+        img.draft("L", (hash_size * 8, hash_size * 8))  # fast JPEG downscale
+        small = img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+        pixels = list(small.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _hash_worker(filepath):
+    """Process pool entry point: returns (filepath, hash or None, error)."""
+    try:
+        return filepath, dhash(filepath), None
+    except Exception as e:
+        return filepath, None, str(e)
+
+
+def hamming(a, b):
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def load_cache(cache_path):
+    """Load the hash cache: {rel_path: [size, mtime_ns, hash_hex]}."""
+    if not cache_path or not Path(cache_path).exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(cache_path, entries):
+    """Write the hash cache atomically."""
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": entries}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def compute_hashes(rel_paths, uploads_path, cache_path=None, workers=None):
+    """
+    Hash every referenced upload, reusing cached hashes where size/mtime match.
+    Returns: ({rel_path: hash_int}, [(rel_path, error), ...], cache_hits)
+    """
+    uploads_path = Path(uploads_path)
+    cache = load_cache(cache_path)
+    hashes = {}
+    errors = []
+    pending = {}
+    cache_hits = 0
+
+    for rel_path in sorted(set(rel_paths)):
+        filepath = uploads_path / rel_path
+        try:
+            st = filepath.stat()
+        except OSError as e:
+            errors.append((rel_path, str(e)))
+            continue
+
+        cached = cache.get(rel_path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            hashes[rel_path] = int(cached[2], 16)
+            cache_hits += 1
+        else:
+            pending[str(filepath)] = (rel_path, st.st_size, st.st_mtime_ns)
+
+    if pending:
+        # Imported here: multiprocessing is slow to import and rarely needed
+        from concurrent.futures import ProcessPoolExecutor
+
+        require_pillow()  # fail fast in the parent, not once per worker
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(pending) // ((workers or os.cpu_count() or 1) * 8))
+            for filepath, value, error in pool.map(
+                _hash_worker, list(pending), chunksize=chunksize
+            ):
+                rel_path, size, mtime_ns = pending[filepath]
+                if value is None:
+                    errors.append((rel_path, error))
+                    continue
+                hashes[rel_path] = value
+                cache[rel_path] = [size, mtime_ns, f"{value:016x}"]
+
+    if cache_path and pending:
+        save_cache(cache_path, cache)
+
+    return hashes, errors, cache_hits
+
+
+class BKTree:
+    """Burkhard-Keller tree for Hamming-distance range queries."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        node = [value, [item], {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming(value, current[0])
+            if distance == 0:
+                current[1].append(item)
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def query(self, value, max_distance):
+        """Return every item within max_distance of value."""
+        if self.root is None:
+            return []
+        results = []
+        stack = [self.root]
+        while stack:
+            node_value, items, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.extend(items)
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return results
+
+
+def find_clusters(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Group files whose hashes are within max_distance of each other.
+    Returns: list of clusters (sorted lists of rel_paths), largest first.
+    """
+    tree = BKTree()
+    for rel_path, value in hashes.items():
+        tree.add(value, rel_path)
+
+    # Union-find over every near-duplicate pair
+    parent = {rel_path: rel_path for rel_path in hashes}
+
+    def find(item):
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for rel_path, value in hashes.items():
+        for other in tree.query(value, max_distance):
+            root_a, root_b = find(rel_path), find(other)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    groups = {}
+    for rel_path in hashes:
+        groups.setdefault(find(rel_path), []).append(rel_path)
+
+    clusters = [sorted(group) for group in groups.values() if len(group) > 1]
+    clusters.sort(key=lambda group: (-len(group), group[0]))
+    return clusters
@@ -0,0 +1,238 @@
+"""
+Run Instrumentation
+===================
+Live progress, per-phase timers and optional profiling for the check and
+extract commands.
+
+  --timings FILE   Print a per-phase timing table and write it as JSON
+                   (wall and CPU seconds, item counts and rates, plus the
+                   Python/CPU details needed to compare machines)
+  --profile FILE   Run under cProfile and save the pstats data to FILE
+                   (browse it with: python -m pstats FILE)
+
+Progress is one self-updating line on stderr (count, files/s, MB/s, ETA),
+drawn only when stderr is a terminal, so piped and logged output is
+unchanged.
+"""
+
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+
+# cProfile/pstats are imported only with --profile
+
+# Seconds between progress redraws
+REFRESH_SECONDS = 0.2
+
+
+def format_duration(seconds):
+    """Returns: "m:ss" or "h:mm:ss" """
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class Progress:
+    """
+    Live status line for a long loop: call update() per item (with its bytes
+    if any). The ETA uses bytes when a byte total is known, else items.
+    """
+
+    def __init__(self, label, total=None, total_bytes=None, unit="files", stream=None):
+        self.label = label
+        self.total = total
+        self.total_bytes = total_bytes
+        self.unit = unit
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty()
+        self.count = 0
+        self.bytes = 0
+        self.start = time.perf_counter()
+        self._last_draw = self.start
+        self._width = 0
+
+    def update(self, count=1, nbytes=0):
+        self.count += count
+        self.bytes += nbytes
+        if self.enabled:
+            now = time.perf_counter()
+            if now - self._last_draw >= REFRESH_SECONDS:
+                self._last_draw = now
+                self._draw(now)
+
+    def _draw(self, now):
+        elapsed = max(now - self.start, 1e-9)
+        done = f"{self.count:,}"
+        if self.total:
+            done += f"/{self.total:,}"
+        parts = [
+            f"  {self.label}: {done} {self.unit}",
+            f"{self.count / elapsed:,.0f} {self.unit}/s",
+        ]
+        if self.bytes:
+            parts.append(f"{self.bytes / elapsed / 2**20:,.1f} MB/s")
+
+        remaining = None
+        if self.total_bytes and self.bytes:
+            remaining = (self.total_bytes - self.bytes) / (self.bytes / elapsed)
+        elif self.total and self.count:
+            remaining = (self.total - self.count) / (self.count / elapsed)
+        if remaining is not None:
+            parts.append(f"ETA {format_duration(max(remaining, 0))}")
+
+        line = "  ".join(parts)
+        # Pad over whatever the previous (longer) line left behind
+        self.stream.write("\r" + line.ljust(self._width))
+        self.stream.flush()
+        self._width = len(line)
+
+    def close(self):
+        """Erase the status line."""
+        if self.enabled and self._width:
+            self.stream.write("\r" + " " * self._width + "\r")
+            self.stream.flush()
+            self._width = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PhaseTimer:
+    """Wall and CPU time per named phase of a run, in the order they ran."""
+
+    def __init__(self):
+        self.phases = {}
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    @contextlib.contextmanager
+    def phase(self, name, **counts):
+        """
+        Time the with-block as phase `name`. counts (files=..., rows=...,
+        bytes=...) are stored with it and can be updated through the yielded
+        dict. A phase that runs again accumulates.
+        """
+        record = self.phases.setdefault(name, {"seconds": 0.0, "cpu_seconds": 0.0})
+        record.update(counts)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["seconds"] += time.perf_counter() - start
+            record["cpu_seconds"] += time.process_time() - cpu_start
+
+    def summary(self, command, status=None):
+        """
+        JSON-ready timings. CPU seconds count every thread, so CPU above wall
+        means the phase ran in parallel; rates are per wall second.
+        Returns: dict
+        """
+        phases = {}
+        for name, record in self.phases.items():
+            entry = {key: value for key, value in record.items()}
+            seconds = record["seconds"]
+            for unit in ("files", "rows"):
+                if record.get(unit) and seconds > 0:
+                    entry[f"{unit}_per_second"] = round(record[unit] / seconds, 1)
+            if record.get("bytes") and seconds > 0:
+                entry["mb_per_second"] = round(record["bytes"] / seconds / 2**20, 2)
+            entry["seconds"] = round(seconds, 4)
+            entry["cpu_seconds"] = round(record["cpu_seconds"], 4)
+            phases[name] = entry
+        return {
+            "command": command,
+            "exit_status": status,
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "phases": phases,
+            "total": {
+                "seconds": round(time.perf_counter() - self.start, 4),
+                "cpu_seconds": round(time.process_time() - self.cpu_start, 4),
+            },
+        }
+
+
+def print_timings(summary):
+    """Print a summary() as a table."""
+    print(f"\n TIMINGS:")
+    print("-" * 70)
+    print(f"  {'Phase':<16}{'Wall':>10}{'CPU':>10}  Rate")
+    for name, entry in summary["phases"].items():
+        rates = []
+        for unit in ("files", "rows"):
+            if f"{unit}_per_second" in entry:
+                rates.append(f"{entry[f'{unit}_per_second']:,.0f} {unit}/s")
+        if "mb_per_second" in entry:
+            rates.append(f"{entry['mb_per_second']:,.1f} MB/s")
+        line = f"  {name:<16}{entry['seconds']:>9.2f}s{entry['cpu_seconds']:>9.2f}s"
+        print(f"{line}  {', '.join(rates)}".rstrip())
+    total = summary["total"]
+    print(f"  {'total':<16}{total['seconds']:>9.2f}s{total['cpu_seconds']:>9.2f}s")
+
+
+def add_arguments(parser):
+    """Add --timings and --profile to a command's parser."""
+    parser.add_argument(
+        "--timings",
+        metavar="FILE",
+        help="Print per-phase wall/CPU times and write them to FILE as JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Run under cProfile and save pstats data to FILE",
+    )
+
+
+def run(command, args, func):
+    """
+    Call func(timer) with a fresh PhaseTimer, under cProfile if --profile was
+    given, then report --timings. Both are written even if func fails.
+    Returns: func's return value
+    """
+    timer = PhaseTimer()
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    status = None
+    try:
+        if profiler:
+            status = profiler.runcall(func, timer)
+        else:
+            status = func(timer)
+        return status
+    finally:
+        if profiler:
+            import pstats
+
+            profiler.dump_stats(args.profile)
+            print(f"\n PROFILE (top 15 by cumulative time):")
+            print("-" * 70)
+            stats = pstats.Stats(args.profile, stream=sys.stdout)
+            stats.sort_stats("cumulative").print_stats(15)
+            print(
+                f"  Saved to {args.profile} (browse: python -m pstats {args.profile})"
+            )
+        if args.timings:
+            summary = timer.summary(command, status)
+            print_timings(summary)
+            with open(args.timings, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            print(f"\n  Timings saved to {args.timings}")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Reconcile Sitemap, CSV and Uploads
+==================================
+Joins the three views of the catalog in one pass over the CSV:
+
+  - products in product-sitemap.xml with no row in the CSV
+  - CSV image URLs (every image column) with no file in the uploads folder
+  - upload images referenced by no product, one line per image with the
+    total size of all its files, so orphan media can be pruned before
+    uploading
+
+Products are matched by slug: the last segment of the sitemap URL against
+the CSV's slug column, or the product name slugified the way WordPress does.
+Uploads are grouped by folder and base name, so -WxH sizes, -scaled copies
+and .webp conversions count as referenced when any of them is; logo.png and
+logo.jpg are still two images.
+
+Usage:
+  python -m wpmedia reconcile "C:/path/to/products.csv" "C:/path/to/uploads" --sitemap ../all_sitemap_urls.txt
+  python -m wpmedia reconcile products.csv uploads --sitemap product-sitemap.xml --orphans orphans.txt
+"""
+
+import argparse
+import csv
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from .check import extract_image_path, sniff_delimiter, split_image_urls
+from .extract import format_size
+from .uploads import load_index
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+PRODUCT_SITEMAP = "product-sitemap"
+SLUG_COLUMNS = ["Slug", "slug", "post_name"]
+
+
+def read_sitemap_urls(sitemap_path):
+    """
+    Product URLs from a sitemap XML file or the all_sitemap_urls.txt dump
+    written by fetch_sitemaps.py (only its product-sitemap sections are used).
+    Returns: [url]
+    """
+    text = Path(sitemap_path).read_text(encoding="utf-8")
+
+    if text.lstrip().startswith("<"):
+        root = ET.fromstring(text)
+        # <url><loc> only: image:loc entries belong to a different namespace
+        return [
+            loc.text.strip()
+            for loc in root.iter(f"{SITEMAP_NS}loc")
+            if loc.text and loc.text.strip()
+        ]
+
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("http"):
+            continue
+        if urlsplit(line).path.endswith(".xml"):
+            current = sections.setdefault(line, [])
+        elif current is not None:
+            current.append(line)
+        else:
+            sections.setdefault(None, []).append(line)
+
+    product_sections = [s for s in sections if s and PRODUCT_SITEMAP in s]
+    if not product_sections:
+        # A plain list of URLs
+        return [url for urls in sections.values() for url in urls]
+    return [url for section in product_sections for url in sections[section]]
+
+
+def product_slug(url):
+    """Last path segment of a product URL (/product/<slug>/)."""
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    return unquote(segments[-1]).lower() if segments else ""
+
+
+def slugify(name):
+    """Approximates WordPress sanitize_title() for product names."""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = re.sub(r"&\w+;|<[^>]*>", "", name.lower())
+    name = re.sub(r"[^a-z0-9\s_-]", "", name)
+    return re.sub(r"[\s-]+", "-", name).strip("-")
+
+
+def reconcile(csv_path, index, sitemap_urls):
+    """
+    Stream the CSV once, joining each row against the sitemap and uploads.
+    Returns: dict of report lists/counts (see main()).
+    """
+    sitemap = {}
+    for url in sitemap_urls:
+        sitemap.setdefault(product_slug(url), url)
+    matched_slugs = set()
+    referenced = set()
+    missing_images = []
+    unlisted_products = []
+    rows = image_urls = 0
+
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f, delimiter=sniff_delimiter(csv_path))
+        image_columns = [c for c in reader.fieldnames if "image" in c.lower()]
+        slug_column = next((c for c in SLUG_COLUMNS if c in reader.fieldnames), None)
+
+        for row in reader:
+            rows += 1
+            name = row.get("Name", row.get("name", "")) or ""
+            sku = row.get("SKU", row.get("sku", ""))
+            slug = (row.get(slug_column) or "").lower() if slug_column else ""
+            slug = slug or slugify(name)
+
+            if slug in sitemap:
+                matched_slugs.add(slug)
+            elif sitemap and row.get("Type", "").lower() != "variation":
+                unlisted_products.append((sku, name))
+
+            for column in image_columns:
+                for url in split_image_urls(row.get(column)):
+                    image_urls += 1
+                    rel_path = extract_image_path(url)
+                    resolved = index.get(rel_path.lower()) if rel_path else None
+                    if resolved is None:
+                        missing_images.append((sku, name, column, url))
+                    else:
+                        referenced.add(resolved)
+
+    # One entry per unreferenced image, covering all of its files
+    sizes = dict(index.with_sizes())
+    referenced_images = 0
+    orphans = []
+    orphan_bytes = 0
+    for files in index.variants().images():
+        if any(rel_path in referenced for rel_path in files):
+            referenced_images += 1
+            continue
+        size = sum(sizes[rel_path] for rel_path in files)
+        orphans.append((files[0], len(files), size))
+        orphan_bytes += size
+
+    return {
+        "rows": rows,
+        "image_columns": image_columns,
+        "image_urls": image_urls,
+        "sitemap_products": len(sitemap),
+        "missing_from_csv": [
+            url for slug, url in sitemap.items() if slug not in matched_slugs
+        ],
+        "unlisted_products": unlisted_products,
+        "missing_images": missing_images,
+        "referenced_images": referenced_images,
+        "orphans": orphans,
+        "orphan_bytes": orphan_bytes,
+    }
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Reconcile product sitemap, WooCommerce CSV and uploads folder",
+    )
+    parser.add_argument("csv_path", help="Path to WooCommerce products CSV")
+    parser.add_argument("uploads_path", help="Path to wp-content/uploads folder")
+    parser.add_argument(
+        "--sitemap",
+        help="product-sitemap.xml or the all_sitemap_urls.txt from fetch_sitemaps.py",
+    )
+    parser.add_argument(
+        "--orphans",
+        help="Write orphaned images (one path per line, the original or the"
+        " file standing in for it) to this file",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="List every problem, not 30"
+    )
+
+    args = parser.parse_args(argv)
+
+    csv_path = Path(args.csv_path)
+    uploads_path = Path(args.uploads_path)
+    for label, path in [("CSV", csv_path), ("Uploads folder", uploads_path)]:
+        if not path.exists():
+            print(f"Error: {label} not found: {path}")
+            return 1
+
+    print("=" * 70)
+    print("Sitemap / CSV / Uploads Reconciliation")
+    print("=" * 70)
+
+    sitemap_urls = []
+    if args.sitemap:
+        sitemap_urls = read_sitemap_urls(args.sitemap)
+        print(f"\nSitemap: {args.sitemap} ({len(sitemap_urls)} product URLs)")
+
+    print(f"\nScanning uploads folder: {uploads_path}")
+    index = load_index(uploads_path, with_sizes=True)
+    print(f"  Found {len(index)} files")
+
+    print(f"\nReading CSV: {csv_path}")
+    result = reconcile(csv_path, index, sitemap_urls)
+    print(f"  Image columns: {', '.join(result['image_columns']) or '(none)'}")
+    print(f"  {result['rows']} rows, {result['image_urls']} image URLs")
+
+    limit = None if args.verbose else 30
+
+    def show(title, items, fmt):
+        print(f"\n {title} ({len(items)}):")
+        print("-" * 70)
+        for item in items[:limit]:
+            print(fmt(item))
+        if limit and len(items) > limit:
+            print(f"  ... and {len(items) - limit} more")
+
+    if args.sitemap:
+        show(
+            "SITEMAP PRODUCTS MISSING FROM CSV",
+            result["missing_from_csv"],
+            lambda url: f"  {url}",
+        )
+        show(
+            "CSV PRODUCTS NOT IN SITEMAP",
+            result["unlisted_products"],
+            lambda p: f"  [{p[0]}] {p[1][:60]}",
+        )
+
+    show(
+        "CSV IMAGES MISSING ON DISK",
+        result["missing_images"],
+        lambda m: f"  [{m[0]}] {m[1][:40]}\n         {m[2]}: {m[3]}",
+    )
+    show(
+        "ORPHANED UPLOADS",
+        result["orphans"],
+        lambda o: (
+            f"  {o[0]} ({o[1]} files, {format_size(o[2])})"
+            if o[1] > 1
+            else f"  {o[0]} ({format_size(o[2])})"
+        ),
+    )
+
+    if args.orphans:
+        with open(args.orphans, "w", encoding="utf-8") as f:
+            for rel_path, _, _ in result["orphans"]:
+                f.write(rel_path + "\n")
+        print(f"\n  Orphan list written to: {args.orphans}")
+
+    print("\n" + "=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+    if args.sitemap:
+        print(f"  Sitemap products:         {result['sitemap_products']}")
+        print(f"  Missing from CSV:         {len(result['missing_from_csv'])}")
+        print(f"  CSV products not listed:  {len(result['unlisted_products'])}")
+    print(f"  CSV images missing:       {len(result['missing_images'])}")
+    print(f"  Referenced images:        {result['referenced_images']}")
+    print(f"  Orphaned upload images:   {len(result['orphans'])}")
+    print(f"  Orphaned size:            {format_size(result['orphan_bytes'])}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Async Remote Image URL Verification
+===================================
+Checks that every image URL in a product CSV actually resolves on the live
+host or CDN, using HEAD requests (falling back to a 1-byte ranged GET for
+servers that reject HEAD).
+
+  - asyncio with a global concurrency cap and a per-host connection limit
+  - keep-alive connections are pooled and reused per host
+  - per-request timeouts; redirects are followed (up to MAX_REDIRECTS)
+  - results are cached on disk with a TTL so reruns skip verified URLs
+
+Standard library only. The HTTP client is deliberately minimal: it speaks
+HTTP/1.1, never downloads bodies it doesn't need, and closes any connection
+it can't safely reuse.
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit
+
+DEFAULT_CONCURRENCY = 50
+DEFAULT_PER_HOST = 8
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_TTL_HOURS = 24.0
+
+MAX_REDIRECTS = 5
+# Bodies larger than this are not drained; the connection is dropped instead
+MAX_DRAIN_BYTES = 64 * 1024
+USER_AGENT = "NaturallyFit-ImageChecker/1.0"
+
+CACHE_VERSION = 1
+
+# RFC 3986 characters left as-is in a request target ("%" keeps escapes intact)
+PATH_SAFE = "/:@!$&'()*+,;=-._~%"
+QUERY_SAFE = PATH_SAFE + "?"
+
+
+def ascii_host(host):
+    """Hostname as sent on the wire: IDNA for non-ASCII names, [] for IPv6."""
+    if ":" in host:
+        return f"[{host}]"
+    try:
+        host.encode("ascii")
+        return host
+    except UnicodeEncodeError:
+        return host.encode("idna").decode("ascii")
+
+
+def request_target(parts):
+    """Percent-encoded path and query of a urlsplit() result."""
+    target = quote(parts.path or "/", safe=PATH_SAFE)
+    if parts.query:
+        target += "?" + quote(parts.query, safe=QUERY_SAFE)
+    return target
+
+
+class HostPool:
+    """Idle keep-alive connections and a connection limit for one host."""
+
+    def __init__(self, limit):
+        self.idle = []
+        self.limit = asyncio.Semaphore(limit)
+
+
+class ConnectionPool:
+    """Per-host pools of keep-alive HTTP/1.1 connections."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.hosts = {}
+        self.ssl_context = ssl.create_default_context()
+
+    def host_pool(self, key):
+        if key not in self.hosts:
+            self.hosts[key] = HostPool(self.per_host)
+        return self.hosts[key]
+
+    async def request(self, method, url, headers=None):
+        """Send one request and return (status, {lowercase header: value})."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {scheme or '(none)'}")
+        host = ascii_host(parts.hostname or "")
+        port = parts.port or (443 if scheme == "https" else 80)
+
+        lines = [
+            f"{method} {request_target(parts)} HTTP/1.1",
+            f"Host: {host}" + (f":{parts.port}" if parts.port else ""),
+            f"User-Agent: {USER_AGENT}",
+            "Accept: image/*,*/*;q=0.8",
+            "Connection: keep-alive",
+        ]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        pool = self.host_pool((scheme, host, port))
+        async with pool.limit:
+            # Retried here, holding the same slot, while idle connections fail
+            while True:
+                reused = bool(pool.idle)
+                if reused:
+                    reader, writer = pool.idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(
+                            host.strip("[]"),
+                            port,
+                            ssl=self.ssl_context if scheme == "https" else None,
+                        ),
+                        self.timeout,
+                    )
+
+                try:
+                    writer.write(request)
+                    status, response_headers, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader, method), self.timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if not reused:
+                        raise
+                    # The server closed an idle keep-alive connection; try the next
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    pool.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, response_headers
+
+    async def _read_response(self, reader, method):
+        """Read status line and headers, then drain (or refuse) the body."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        try:
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise ConnectionError(f"bad status line: {status_line[:60]!r}")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, headers, keep_alive
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            drained = 0
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailer section ends with an empty line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                drained += size
+                if drained > MAX_DRAIN_BYTES:
+                    return status, headers, False
+                await reader.readexactly(size + 2)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length > MAX_DRAIN_BYTES:
+                return status, headers, False
+            await reader.readexactly(length)
+        else:
+            # Body delimited by connection close - can't reuse
+            keep_alive = False
+
+        return status, headers, keep_alive
+
+    def close(self):
+        for pool in self.hosts.values():
+            for _, writer in pool.idle:
+                writer.close()
+            pool.idle.clear()
+
+
+async def check_url(pool, url):
+    """
+    Verify a single image URL.
+    Returns: {"url", "final_url", "status", "ok", "content_type", "error"}
+    """
+    result = {
+        "url": url,
+        "final_url": url,
+        "status": None,
+        "ok": False,
+        "content_type": None,
+        "error": None,
+    }
+    current = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await pool.request("HEAD", current)
+            if status in (405, 501):
+                # HEAD not allowed - ask for the first byte only
+                status, headers = await pool.request(
+                    "GET", current, {"Range": "bytes=0-0"}
+                )
+            if status in (301, 302, 303, 307, 308) and "location" in headers:
+                current = urljoin(current, headers["location"])
+                continue
+            break
+        else:
+            result["error"] = f"too many redirects (> {MAX_REDIRECTS})"
+            return result
+    except asyncio.TimeoutError:
+        result["error"] = "timeout"
+        return result
+    except (OSError, ValueError) as e:
+        result["error"] = str(e) or e.__class__.__name__
+        return result
+
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    result.update(final_url=current, status=status, content_type=content_type or None)
+    if status in (200, 206):
+        if content_type and not content_type.startswith("image/"):
+            result["error"] = f"not an image ({content_type})"
+        else:
+            result["ok"] = True
+    else:
+        result["error"] = f"HTTP {status}"
+    return result
+
+
+def is_cacheable(result):
+    """Only definitive answers are cached; timeouts and 5xx are retried next run."""
+    status = result["status"]
+    return status is not None and status < 500 and status != 429
+
+
+def load_cache(cache_path, ttl_seconds):
+    """Load unexpired results: {url: result}."""
+    if not cache_path or not Path(cache_path).exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    cutoff = time.time() - ttl_seconds
+    return {
+        url: entry
+        for url, entry in data.get("results", {}).items()
+        if entry.get("checked_at", 0) >= cutoff
+    }
+
+
+def save_cache(cache_path, results):
+    """Write the result cache atomically."""
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "results": results}, f)
+    os.replace(tmp_path, cache_path)
+
+
+async def _verify_all(urls, concurrency, per_host, timeout):
+    pool = ConnectionPool(per_host=per_host, timeout=timeout)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def bounded(url):
+        async with limit:
+            return await check_url(pool, url)
+
+    try:
+        return await asyncio.gather(*(bounded(url) for url in urls))
+    finally:
+        pool.close()
+
+
+def verify_urls(
+    urls,
+    cache_path=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    per_host=DEFAULT_PER_HOST,
+    timeout=DEFAULT_TIMEOUT,
+    ttl_hours=DEFAULT_TTL_HOURS,
+):
+    """
+    Verify image URLs, skipping any with an unexpired cached result.
+    Returns: ({url: result}, cache_hits)
+    """
+    unique = list(dict.fromkeys(urls))
+    cache = load_cache(cache_path, ttl_hours * 3600)
+    results = {url: cache[url] for url in unique if url in cache}
+    cache_hits = len(results)
+
+    pending = [url for url in unique if url not in results]
+    if pending:
+        checked_at = time.time()
+        for result in asyncio.run(_verify_all(pending, concurrency, per_host, timeout)):
+            result["checked_at"] = checked_at
+            results[result["url"]] = result
+            if is_cacheable(result):
+                cache[result["url"]] = result
+
+    if cache_path and pending:
+        save_cache(cache_path, cache)
+
+    return results, cache_hits
@@ -0,0 +1,97 @@
+"""
+Bulk Image URL Rewriting
+========================
+Host and prefix rewrite rules for moving media to a new host or CDN, applied
+by `check --fix --rewrite ...` to every URL in every image column.
+
+A rule is OLD=NEW:
+  naturallyfit.ca=cdn.naturallyfit.ca          host rule: any scheme, same path
+  naturallyfit.ca=https://cdn.example.com      host rule, scheme replaced too
+  https://naturallyfit.ca/wp-content/uploads/=https://cdn.example.com/media/
+                                               prefix rule: literal URL prefix
+
+All rules are compiled into one anchored regex, so each URL is matched once
+no matter how many rules there are. The first matching rule wins, so list
+specific prefixes before the hosts they live on.
+"""
+
+import re
+
+# scheme://[user@] ahead of a host rule's host
+SCHEME_PATTERN = r"[a-zA-Z][a-zA-Z0-9+.-]*://(?:[^/@?#]*@)?"
+
+
+def parse_rule(text):
+    """
+    Parse an OLD=NEW rule.
+    Returns: (old, new); raises ValueError if either side is empty.
+    """
+    old, sep, new = text.partition("=")
+    old, new = old.strip(), new.strip()
+    if not sep or not old or not new:
+        raise ValueError(f"Rewrite rule must look like OLD=NEW: {text!r}")
+    return old, new
+
+
+def read_rules_file(path):
+    """OLD=NEW rules, one per line; blank lines and # comments are skipped."""
+    rules = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                rules.append(parse_rule(line))
+    return rules
+
+
+class RewriteRules:
+    """Compiled rewrite rules with a per-rule count of rewritten URLs."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.counts = [0] * len(self.rules)
+
+        alternatives = []
+        for i, (old, new) in enumerate(self.rules):
+            if "://" in old:
+                alternatives.append(f"(?P<r{i}>{re.escape(old)})")
+            else:
+                # Hostnames are case-insensitive; stop at the end of the host
+                alternatives.append(
+                    f"(?P<r{i}>{SCHEME_PATTERN}(?i:{re.escape(old)}))(?=[/:?#]|$)"
+                )
+        self.pattern = re.compile("|".join(alternatives))
+
+    def __len__(self):
+        return len(self.rules)
+
+    def rewrite_url(self, url):
+        """Apply the first matching rule to url (unchanged if none match)."""
+        match = self.pattern.match(url)
+        if match is None:
+            return url
+        i = int(match.lastgroup[1:])
+        self.counts[i] += 1
+        old, new = self.rules[i]
+        if "://" not in old and "://" not in new:
+            # Host rule: keep the URL's own scheme
+            new = match.group()[: match.group().index("://") + 3] + new
+        return new + url[match.end() :]
+
+    def rewrite_cell(self, cell):
+        """Rewrite every URL in a comma-separated image cell, keeping its spacing."""
+        if not cell:
+            return cell
+        pieces = cell.split(",")
+        for i, piece in enumerate(pieces):
+            url = piece.strip()
+            if url:
+                start = piece.index(url)
+                new = self.rewrite_url(url)
+                if new is not url:
+                    pieces[i] = piece[:start] + new + piece[start + len(url) :]
+        return ",".join(pieces)
+
+    def summary(self):
+        """Returns: [(old, new, count)] in rule order."""
+        return [(old, new, n) for (old, new), n in zip(self.rules, self.counts)]
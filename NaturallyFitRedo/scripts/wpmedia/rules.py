@@ -0,0 +1,55 @@
+"""
+WordPress Upload Naming Rules
+=============================
+The filename conventions WordPress uses for generated image sizes, shared by
+the checker and the extractor so both classify files the same way.
+"""
+
+import posixpath
+import re
+
+# Regex to match WordPress thumbnail suffixes like -150x150, -300x300, -1024x768, etc.
+THUMBNAIL_PATTERN = re.compile(r"-\d+x\d+$")
+
+# Image extensions to process
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"}
+WEBP_EXTENSION = {".webp"}
+
+
+def to_posix(rel_path):
+    """Uploads-relative path with forward slashes (how URLs and indexes store it)."""
+    return str(rel_path).replace("\\", "/")
+
+
+def _stem_and_ext(filename):
+    """Filename split into (stem, extension), for either slash style."""
+    return posixpath.splitext(posixpath.basename(to_posix(filename)))
+
+
+def is_thumbnail(filename):
+    """Check if a filename is a WordPress-generated thumbnail."""
+    stem = _stem_and_ext(filename)[0]  # filename without extension
+    return bool(THUMBNAIL_PATTERN.search(stem))
+
+
+def is_scaled(filename):
+    """Check if a filename is a WordPress 'scaled' version (WP 5.3+)."""
+    return _stem_and_ext(filename)[0].endswith("-scaled")
+
+
+def get_original_name(filename):
+    """Get the base name without thumbnail suffix."""
+    stem, ext = _stem_and_ext(filename)
+    # Remove thumbnail suffix if present
+    clean_stem = THUMBNAIL_PATTERN.sub("", stem)
+    # Remove -scaled suffix if present
+    if clean_stem.endswith("-scaled"):
+        clean_stem = clean_stem[:-7]
+    return clean_stem + ext
+
+
+def variant_key(rel_path):
+    """Folder + base name shared by an original and all its generated variants."""
+    folder, _, filename = to_posix(rel_path).rpartition("/")
+    base = posixpath.splitext(get_original_name(filename))[0]
+    return f"{folder}/{base}".lower()
@@ -0,0 +1,349 @@
+"""
+Uploads Folder Index
+====================
+One walk of a wp-content/uploads folder, shared by every tool in the package.
+
+The checker needs a case-insensitive path/filename lookup, the extractor needs
+the file list with sizes. Both come from the same UploadsIndex, and
+load_index() keeps one per folder for the life of the process, so running
+check and extract in the same session walks the folder once.
+
+The index is laid out to stay small on million-file trees: folder prefixes
+are stored once, filenames live in one string addressed by array offsets,
+and lookups go through a sorted array of filename hashes instead of a dict
+holding two string keys per file. Files that share a name in different
+folders all stay reachable (see matches()).
+"""
+
+import os
+import posixpath
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .instrument import Progress
+
+# Folders listed at once. Each listing is a round-trip on an SMB/NFS mount,
+# so overlapping them is what makes a networked scan fast.
+DEFAULT_WALK_WORKERS = 8
+
+
+def list_dir(dirpath, with_stats=False):
+    """
+    One folder's listing (and each file's os.stat_result; a link whose
+    target is gone gets the link's own).
+    Returns: (file names, stats or None, subfolder names), or None if the
+    folder can't be read
+    """
+    try:
+        entries = list(os.scandir(dirpath))
+    except OSError:
+        return None
+    names = []
+    stats = [] if with_stats else None
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            # Like os.walk: a linked folder is neither a file nor descended into
+            if not entry.is_symlink():
+                subdirs.append(entry.name)
+            continue
+        if stats is not None:
+            try:
+                st = entry.stat()
+            except OSError:
+                # A dangling link counts as itself; a file deleted since the
+                # listing is dropped
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+            stats.append(st)
+        names.append(entry.name)
+    return names, stats, subdirs
+
+
+def _file_size(path):
+    """Size of a file, or of the link itself when its target is gone."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        try:
+            return path.lstat().st_size
+        except OSError:
+            return 0
+
+
+def walk_parallel(root_item, visit, workers=None):
+    """
+    Walk a folder tree in os.walk order (parents first, children in the order
+    visit() returns them) with visit() running on a thread pool, a bounded
+    window ahead of the folder being yielded, so the order never depends on
+    which call finishes first.
+
+    visit(item) returns (result, [child items]), or None to skip the folder.
+    Yields: (item, result)
+    """
+    workers = workers or DEFAULT_WALK_WORKERS
+    if workers <= 1:
+        stack = [root_item]
+        while stack:
+            item = stack.pop()
+            visited = visit(item)
+            if visited is None:
+                continue
+            result, children = visited
+            yield item, result
+            # Reversed so the stack pops children in order
+            stack.extend(reversed(children))
+        return
+
+    window = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # [item, future]; the top of the stack is yielded next
+        stack = [[root_item, None]]
+        pending = 0
+        while stack:
+            # Keep the next `window` folders in walk order being visited
+            for entry in reversed(stack):
+                if pending >= window:
+                    break
+                if entry[1] is None:
+                    entry[1] = pool.submit(visit, entry[0])
+                    pending += 1
+
+            item, future = stack.pop()
+            pending -= 1
+            visited = future.result()
+            if visited is None:
+                continue
+            result, children = visited
+            yield item, result
+            stack.extend([child, None] for child in reversed(children))
+
+
+def walk_tree(root, with_sizes=False, workers=None):
+    """
+    Every readable folder under root in os.walk order, listed in parallel
+    (see walk_parallel).
+    Yields: (prefix, names, sizes or None), prefix "" or "2024/05/"
+    """
+
+    def visit(item):
+        dirpath, prefix = item
+        listing = list_dir(dirpath, with_stats=with_sizes)
+        if listing is None:
+            return None
+        names, stats, subdirs = listing
+        sizes = [st.st_size for st in stats] if with_sizes else None
+        children = [
+            (os.path.join(dirpath, name), prefix + name + "/") for name in subdirs
+        ]
+        return (names, sizes), children
+
+    for (_, prefix), (names, sizes) in walk_parallel((str(root), ""), visit, workers):
+        yield prefix, names, sizes
+
+
+class UploadsIndex:
+    """
+    Every file under an uploads folder, as forward-slash relative paths.
+
+    Also works as the checker's lookup: `key in index`, index[key] and
+    index.get(key) take a lowercased relative path or bare filename and
+    return the file's real relative path.
+    """
+
+    def __init__(self, root, dirs, dir_ids, names, sizes=None):
+        """dirs: folder prefixes ("" or "2024/05/"); dir_ids/names per file."""
+        self.root = Path(root)
+        self.dirs = dirs
+        self._dirs_lower = [folder.lower() for folder in dirs]
+        self.dir_ids = array("I", dir_ids)
+        self._names = "".join(names)
+        self._offsets = array("Q", [0])
+        end = 0
+        for name in names:
+            end += len(name)
+            self._offsets.append(end)
+        self.sizes = array("Q", sizes) if sizes is not None else None
+        self._variants = None
+        self._folder_stems = None
+
+        # Filename hash -> file number, sorted by hash then walk order
+        hashes = [hash(name.lower()) for name in names]
+        order = sorted(range(len(names)), key=hashes.__getitem__)
+        self._hashes = array("q", [hashes[i] for i in order])
+        self._by_hash = array("I", order)
+
+    @classmethod
+    def build(cls, root, with_sizes=False, workers=None):
+        """Walk root once (same order as os.walk) and record every file."""
+        root = Path(root)
+        dirs = []
+        dir_ids = []
+        names = []
+        sizes = [] if with_sizes else None
+
+        with Progress("Scanning", unit="files") as progress:
+            for prefix, dir_names, dir_sizes in walk_tree(root, with_sizes, workers):
+                dir_id = len(dirs)
+                dirs.append(prefix)
+                dir_ids.extend([dir_id] * len(dir_names))
+                names.extend(dir_names)
+                if sizes is not None:
+                    sizes.extend(dir_sizes)
+                progress.update(len(dir_names))
+
+        return cls(root, dirs, dir_ids, names, sizes)
+
+    def __len__(self):
+        return len(self.dir_ids)
+
+    def name(self, i):
+        return self._names[self._offsets[i] : self._offsets[i + 1]]
+
+    def rel_path(self, i):
+        return self.dirs[self.dir_ids[i]] + self.name(i)
+
+    def __iter__(self):
+        dirs, names, offsets = self.dirs, self._names, self._offsets
+        for i, dir_id in enumerate(self.dir_ids):
+            yield dirs[dir_id] + names[offsets[i] : offsets[i + 1]]
+
+    def values(self):
+        return iter(self)
+
+    def items(self):
+        """Returns: iterator of (lowercased rel_path, rel_path), one per file."""
+        for rel_path in self:
+            yield rel_path.lower(), rel_path
+
+    def variants(self):
+        """VariantIndex of this tree, built on first use."""
+        if self._variants is None:
+            from .variants import VariantIndex
+
+            self._variants = VariantIndex(self)
+        return self._variants
+
+    def folder_stems(self):
+        """
+        Lowercased filename stems of each folder, sorted for prefix lookups
+        and built on first use.
+        Returns: {lowercased folder prefix: ([stem], [file number])}
+        """
+        if self._folder_stems is None:
+            by_folder = {}
+            for i, dir_id in enumerate(self.dir_ids):
+                stem = posixpath.splitext(self.name(i))[0].lower()
+                by_folder.setdefault(self._dirs_lower[dir_id], []).append((stem, i))
+            self._folder_stems = {}
+            for folder, entries in by_folder.items():
+                entries.sort()
+                self._folder_stems[folder] = (
+                    [stem for stem, _ in entries],
+                    [i for _, i in entries],
+                )
+        return self._folder_stems
+
+    def abs_path(self, rel_path):
+        return self.root / rel_path
+
+    def load_sizes(self):
+        """Stat every file (once) if the index was built without sizes."""
+        if self.sizes is None:
+            self.sizes = array("Q", [_file_size(self.abs_path(rel)) for rel in self])
+        return self.sizes
+
+    def with_sizes(self):
+        """Returns: [(rel_path, size)]"""
+        return list(zip(self, self.load_sizes()))
+
+    def _candidates(self, name_lower):
+        """File numbers whose name matches, in walk order."""
+        hashes, by_hash, names, offsets = (
+            self._hashes,
+            self._by_hash,
+            self._names,
+            self._offsets,
+        )
+        h = hash(name_lower)
+        i = bisect_left(hashes, h)
+        found = []
+        while i < len(hashes) and hashes[i] == h:
+            f = by_hash[i]
+            if names[offsets[f] : offsets[f + 1]].lower() == name_lower:
+                found.append(f)
+            i += 1
+        return found
+
+    def matches(self, filename):
+        """Every file with this name (any case), in any folder."""
+        return [self.rel_path(f) for f in self._candidates(filename.lower())]
+
+    def get(self, key, default=None):
+        """
+        Real relative path for a lowercased relative path, or for a bare
+        filename (the root-level file if there is one, else the first found).
+        """
+        folder, slash, name = key.rpartition("/")
+        found = self._candidates(name)
+        if not found:
+            return default
+        prefix = folder + slash
+        for f in found:
+            if self._dirs_lower[self.dir_ids[f]] == prefix:
+                return self.rel_path(f)
+        return default if slash else self.rel_path(found[0])
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __getitem__(self, key):
+        rel_path = self.get(key)
+        if rel_path is None:
+            raise KeyError(key)
+        return rel_path
+
+    def lookup_items(self):
+        """
+        Every key get() accepts with its answer, for bulk joins: the full
+        lowercased paths, then bare filenames (first occurrence wins).
+        Returns: ([key], [rel_path])
+        """
+        keys = []
+        values = []
+        for rel_path in self:
+            keys.append(rel_path.lower())
+            values.append(rel_path)
+        for i in range(len(values)):
+            keys.append(self.name(i).lower())
+            values.append(values[i])
+        return keys, values
+
+
+_indexes = {}
+
+
+def load_index(root, with_sizes=False, workers=None):
+    """UploadsIndex for root, walked on first use and reused afterwards."""
+    key = os.path.normcase(os.path.abspath(root))
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = UploadsIndex.build(
+            root, with_sizes=with_sizes, workers=workers
+        )
+    elif with_sizes:
+        index.load_sizes()
+    return index
+
+
+def clear_index_cache():
+    """Forget cached indexes (e.g. after files were added to the folder)."""
+    _indexes.clear()
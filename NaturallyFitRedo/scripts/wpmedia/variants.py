@@ -0,0 +1,167 @@
+"""
+Variant Groups
+==============
+WordPress stores each upload once as the original and again at every
+registered size (-150x150, -1024x768, ...), plus a -scaled copy for big
+images and sometimes a .webp conversion. VariantIndex groups every image in
+an UploadsIndex under its original's key (rules.variant_key) in one pass,
+recording each variant's kind and its dimensions from the filename, so the
+best surviving file of any image is a dict lookup away.
+
+A group can hold more than one image: logo.png and logo.jpg share a key but
+are separate uploads, so each file type is its own image and never stands
+in for the other. WebP conversions go with the group's first image, and
+only stand in when nothing else is left.
+"""
+
+import posixpath
+from collections import namedtuple
+
+from .rules import (
+    IMAGE_EXTENSIONS,
+    THUMBNAIL_PATTERN,
+    WEBP_EXTENSION,
+    get_original_name,
+    variant_key,
+)
+
+# Variant kinds, in order of preference
+ORIGINAL = 0
+SCALED = 1
+SIZE = 2
+
+Variant = namedtuple("Variant", "rel_path kind width height ext")
+
+
+def classify(filename):
+    """
+    Kind and size of an upload image from its name (None if not an image).
+    Returns: (kind, width, height, ext); width/height are None unless -WxH
+    """
+    stem, ext = posixpath.splitext(filename)
+    ext = ext.lower()
+    if ext not in IMAGE_EXTENSIONS and ext not in WEBP_EXTENSION:
+        return None
+    size = THUMBNAIL_PATTERN.search(stem)
+    if size:
+        width, height = size.group()[1:].split("x")
+        return SIZE, int(width), int(height), ext
+    if get_original_name(filename) != filename:
+        return SCALED, None, None, ext
+    return ORIGINAL, None, None, ext
+
+
+def _preference(member):
+    """Sort key: originals, then -scaled, then sizes largest first."""
+    kind, width, height, ext, number = member
+    area = width * height if width else 0
+    return (ext in WEBP_EXTENSION, kind, -area, number)
+
+
+class VariantIndex:
+    """Upload images grouped by original key, best surviving file first."""
+
+    def __init__(self, index):
+        self.index = index
+        groups = {}
+        for number, rel_path in enumerate(index):
+            info = classify(rel_path.rsplit("/", 1)[-1])
+            if info is None:
+                continue
+            groups.setdefault(variant_key(rel_path), []).append((*info, number))
+        for members in groups.values():
+            members.sort(key=_preference)
+        self.groups = groups
+
+    def __len__(self):
+        return len(self.groups)
+
+    def variants(self, rel_path):
+        """Every file in the image's group (any of its files or URL paths), best first."""
+        return [
+            Variant(self.index.rel_path(number), kind, width, height, ext)
+            for kind, width, height, ext, number in self.groups.get(
+                variant_key(rel_path), ()
+            )
+        ]
+
+    def _images(self, members, include_webp):
+        """
+        A group's members split into images, best member first in each: one
+        per non-WebP extension, WebP files added to the first one (or on
+        their own when there is nothing else).
+        Returns: [(ext, [member])]
+        """
+        images = {}
+        webp = []
+        for member in members:
+            if member[3] in WEBP_EXTENSION:
+                if include_webp:
+                    webp.append(member)
+            else:
+                images.setdefault(member[3], []).append(member)
+        if not images:
+            return [(webp[0][3], webp)] if webp else []
+        images = list(images.items())
+        images[0][1].extend(webp)
+        return images
+
+    def best(self, rel_path, include_webp=False):
+        """
+        The file to use for an image (any of its files or URL paths): its
+        original, else the -scaled copy, else the largest size, of the same
+        file type, with WebP copies as a last resort. A WebP path gets its own
+        WebP files, or the image it was converted from when WebP files don't
+        count (include_webp). None if nothing qualifies.
+        """
+        images = self._images(self.groups.get(variant_key(rel_path), ()), include_webp)
+        if not images:
+            return None
+        ext = posixpath.splitext(rel_path)[1].lower()
+        if ext in WEBP_EXTENSION:
+            # Its own WebP files if they count, else what it was converted from
+            chosen = [m for _, members in images for m in members if m[3] == ext]
+            chosen = chosen or images[0][1]
+        else:
+            chosen = next((members for e, members in images if e == ext), None)
+            if chosen is None:
+                if images[0][0] not in WEBP_EXTENSION:
+                    # Only other file types left: those are different uploads
+                    return None
+                chosen = images[0][1]
+        return self.index.rel_path(chosen[0][4])
+
+    def images(self, include_webp=True):
+        """
+        Every image's files, its original (or the best variant left) first.
+        A group holds one image per file type (see best()).
+        Returns: [[rel_path]] in walk order of their first file
+        """
+        images = sorted(
+            [member[4] for member in members]
+            for group in self.groups.values()
+            for _, members in self._images(group, include_webp)
+        )
+        return [
+            [self.index.rel_path(number) for number in numbers] for numbers in images
+        ]
+
+    def representatives(self, include_webp=False):
+        """
+        One file per image: its original, or the best variant left when the
+        original is gone (what a fix should point a product at).
+        Returns: [rel_path] in walk order
+        """
+        return [files[0] for files in self.images(include_webp)]
+
+    def fallbacks(self, include_webp=False):
+        """
+        For every image whose original is gone, the file that stands in for it.
+        Returns: {file number: group key}
+        """
+        chosen = {}
+        for key, group in self.groups.items():
+            for _, members in self._images(group, include_webp):
+                if members[0][0] != ORIGINAL:
+                    chosen[members[0][4]] = key
+        return chosen